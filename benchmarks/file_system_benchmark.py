@@ -0,0 +1,334 @@
+"""
+Benchmark de throughput dos backends de `seisbai_tools.file_system`.
+
+Mede `upload`, `download`, `read_file_chunks`, `list_files_recursive` e `sync`
+variando tamanho de chunk, distribuição de tamanho de arquivos e nível de
+concorrência. Os resultados são emitidos em JSON para que regressões possam ser
+acompanhadas entre versões.
+
+Cenários de árvore sintética
+----------------------------
+small
+    Muitos arquivos pequenos (padrão: 500 arquivos de 4 KB a 64 KB).
+huge
+    Poucos arquivos grandes (padrão: 2 arquivos de 256 MB).
+
+Backends
+--------
+nfs
+    Usa `NFSClient` sobre um diretório local (stand-in de um mount NFS).
+    Se `--nfs-mount` não for informado, um diretório temporário é usado.
+smb
+    Usa `SMBClient` contra um servidor Samba. Para rodar localmente:
+
+        docker run -d --name seisbai-samba -p 445:445 dperson/samba \\
+            -u "bench;bench" -s "bench;/share;yes;no;no;bench"
+
+    e então `--smb-server 127.0.0.1 --smb-user bench --smb-password bench
+    --smb-share bench`. Sem `--smb-server`, o backend é registrado como
+    ignorado no relatório.
+s3
+    Usa `S3Client` contra um endpoint compatível com S3. Para rodar localmente:
+
+        docker run -d --name seisbai-minio -p 9000:9000 \\
+            -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 \\
+            minio/minio server /data
+
+    e então `--s3-endpoint http://127.0.0.1:9000 --s3-access-key minio
+    --s3-secret-key minio123 --s3-bucket bench` (o bucket deve existir).
+
+Uso
+---
+Com o pacote instalado (`pip install -e .`) ou com a raiz do repositório no
+`PYTHONPATH`:
+
+    python benchmarks/file_system_benchmark.py --backends nfs smb \\
+        --chunk-sizes 65536 1048576 --concurrency 1 4 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from seisbai_tools.file_system.factory import FileSystemFactory
+from seisbai_tools.file_system.interface import FileSystemInterface
+from seisbai_tools.file_system.types import SyncMode
+
+MB = 1024 * 1024
+
+ClientFactory = Callable[[], FileSystemInterface]
+
+
+# --------------------------------------------------
+# ÁRVORES SINTÉTICAS
+# --------------------------------------------------
+
+def build_tree(base: str, file_count: int, min_size: int, max_size: int, seed: int) -> List[Tuple[str, int]]:
+    """
+    Gera uma árvore sintética em `base` e retorna `(caminho_relativo, tamanho)`.
+
+    Os arquivos são distribuídos em subpastas de até 50 arquivos para exercitar
+    também a listagem recursiva.
+    """
+    rng = random.Random(seed)
+    block = os.urandom(min(max_size, 4 * MB))
+    files: List[Tuple[str, int]] = []
+
+    for index in range(file_count):
+        rel = f"dir_{index // 50:04d}/file_{index:06d}.bin"
+        size = rng.randint(min_size, max_size)
+        full = os.path.join(base, rel)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+
+        with open(full, "wb") as f:
+            remaining = size
+            while remaining > 0:
+                piece = block[:min(len(block), remaining)]
+                f.write(piece)
+                remaining -= len(piece)
+
+        files.append((rel, size))
+
+    return files
+
+
+# --------------------------------------------------
+# MEDIÇÃO
+# --------------------------------------------------
+
+def measure(operation: str, total_bytes: int, file_count: int, function: Callable[[], Any], **params: Any) -> Dict[str, Any]:
+    start = time.perf_counter()
+    error: Optional[str] = None
+
+    try:
+        function()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    elapsed = time.perf_counter() - start
+
+    return {
+        "operation": operation,
+        "params": params,
+        "seconds": round(elapsed, 6),
+        "bytes": total_bytes,
+        "files": file_count,
+        "mb_per_second": round(total_bytes / MB / elapsed, 3) if elapsed > 0 and total_bytes and not error else None,
+        "files_per_second": round(file_count / elapsed, 3) if elapsed > 0 and not error else None,
+        "error": error,
+    }
+
+
+def run_parallel(client_factory: ClientFactory, concurrency: int, jobs: List[Callable[[FileSystemInterface], None]]):
+    """
+    Executa `jobs` distribuídos em `concurrency` workers.
+
+    Cada worker abre o próprio client, já que conexões SMB não são
+    compartilháveis entre threads de forma segura.
+    """
+    buckets = [jobs[i::concurrency] for i in range(concurrency)]
+
+    def worker(bucket: List[Callable[[FileSystemInterface], None]]):
+        client = client_factory()
+        client.connect()
+        try:
+            for job in bucket:
+                job(client)
+        finally:
+            client.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, bucket) for bucket in buckets if bucket]:
+            future.result()
+
+
+def drain(iterator) -> None:
+    for _ in iterator:
+        pass
+
+
+# --------------------------------------------------
+# CENÁRIOS
+# --------------------------------------------------
+
+def bench_backend(
+    backend: str,
+    client_factory: ClientFactory,
+    scenarios: Dict[str, Tuple[str, List[Tuple[str, int]]]],
+    chunk_sizes: List[int],
+    concurrency_levels: List[int],
+    remote_root: str,
+    work_dir: str,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+
+    admin = client_factory()
+    admin.connect()
+
+    try:
+        for scenario, (local_tree, files) in scenarios.items():
+            total = sum(size for _, size in files)
+            common = {"backend": backend, "scenario": scenario}
+
+            for chunk_size in chunk_sizes:
+                for concurrency in concurrency_levels:
+                    remote_base = f"{remote_root}/{scenario}_c{chunk_size}_p{concurrency}"
+                    download_base = os.path.join(work_dir, f"download_{scenario}_{chunk_size}_{concurrency}")
+                    params = dict(common, chunk_size=chunk_size, concurrency=concurrency)
+
+                    uploads = [
+                        (lambda c, rel=rel: c.upload(os.path.join(local_tree, rel), f"{remote_base}/{rel}", chunk_size, None))
+                        for rel, _ in files
+                    ]
+                    results.append(measure("upload", total, len(files), lambda: run_parallel(client_factory, concurrency, uploads), **params))
+
+                    downloads = [
+                        (lambda c, rel=rel: c.download(f"{remote_base}/{rel}", os.path.join(download_base, rel), chunk_size, None))
+                        for rel, _ in files
+                    ]
+                    results.append(measure("download", total, len(files), lambda: run_parallel(client_factory, concurrency, downloads), **params))
+
+                    reads = [
+                        (lambda c, rel=rel: drain(c.read_file_chunks(f"{remote_base}/{rel}", chunk_size, None)))
+                        for rel, _ in files
+                    ]
+                    results.append(measure("read_file_chunks", total, len(files), lambda: run_parallel(client_factory, concurrency, reads), **params))
+
+                    shutil.rmtree(download_base, ignore_errors=True)
+
+                # Listagem e sync não dependem de concorrência
+                remote_base = f"{remote_root}/{scenario}_c{chunk_size}_sync"
+                params = dict(common, chunk_size=chunk_size)
+                pull_base = os.path.join(work_dir, f"pull_{scenario}_{chunk_size}")
+
+                results.append(measure("sync_push", total, len(files), lambda: admin.sync(local_tree, remote_base, SyncMode.PUSH, chunk_size), **params))
+                results.append(measure("list_files_recursive", 0, len(files), lambda: admin.list_files_recursive(remote_base), **params))
+                results.append(measure("sync_pull", total, len(files), lambda: admin.sync(pull_base, remote_base, SyncMode.PULL, chunk_size), **params))
+                results.append(measure("sync_noop", 0, len(files), lambda: admin.sync(pull_base, remote_base, SyncMode.BIDIRECTIONAL, chunk_size), **params))
+
+                shutil.rmtree(pull_base, ignore_errors=True)
+    finally:
+        try:
+            admin.delete(remote_root)
+        except Exception:
+            pass
+        admin.close()
+
+    return results
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de transferência dos backends de file_system.")
+    parser.add_argument("--backends", nargs="+", default=["nfs"], choices=["nfs", "smb", "s3"])
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=[64 * 1024, MB, 8 * MB])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--small-count", type=int, default=500)
+    parser.add_argument("--small-min", type=int, default=4 * 1024)
+    parser.add_argument("--small-max", type=int, default=64 * 1024)
+    parser.add_argument("--huge-count", type=int, default=2)
+    parser.add_argument("--huge-size", type=int, default=256 * MB)
+    parser.add_argument("--scenarios", nargs="+", default=["small", "huge"], choices=["small", "huge"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--work-dir", default=None, help="Diretório para os dados sintéticos (padrão: temporário).")
+    parser.add_argument("--remote-root", default="seisbai_benchmark")
+    parser.add_argument("--nfs-mount", default=None)
+    parser.add_argument("--smb-server", default=None)
+    parser.add_argument("--smb-port", type=int, default=445)
+    parser.add_argument("--smb-user", default=os.getenv("SMB_USER", ""))
+    parser.add_argument("--smb-password", default=os.getenv("SMB_PASSWORD", ""))
+    parser.add_argument("--smb-share", default=None)
+    parser.add_argument("--s3-endpoint", default=None)
+    parser.add_argument("--s3-access-key", default=os.getenv("S3_ACCESS_KEY"))
+    parser.add_argument("--s3-secret-key", default=os.getenv("S3_SECRET_KEY"))
+    parser.add_argument("--s3-bucket", default=None)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="seisbai_bench_")
+    owns_work_dir = args.work_dir is None
+
+    report: Dict[str, Any] = {
+        "started_at": datetime.now(tz=UTC).isoformat(),
+        "host": platform.node(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("smb_password", "s3_secret_key")},
+        "skipped": {},
+        "results": [],
+    }
+
+    try:
+        scenarios: Dict[str, Tuple[str, List[Tuple[str, int]]]] = {}
+        if "small" in args.scenarios:
+            tree = os.path.join(work_dir, "tree_small")
+            scenarios["small"] = (tree, build_tree(tree, args.small_count, args.small_min, args.small_max, args.seed))
+        if "huge" in args.scenarios:
+            tree = os.path.join(work_dir, "tree_huge")
+            scenarios["huge"] = (tree, build_tree(tree, args.huge_count, args.huge_size, args.huge_size, args.seed))
+
+        for backend in args.backends:
+            if backend == "nfs":
+                mount = args.nfs_mount or os.path.join(work_dir, "nfs_mount")
+                os.makedirs(mount, exist_ok=True)
+                factory: ClientFactory = lambda mount=mount: FileSystemFactory.create("nfs", mount_point=mount)
+            elif backend == "s3":
+                if not args.s3_bucket:
+                    report["skipped"]["s3"] = "--s3-bucket não informado"
+                    continue
+                factory = lambda: FileSystemFactory.create(
+                    "s3",
+                    bucket=args.s3_bucket,
+                    endpoint_url=args.s3_endpoint,
+                    access_key=args.s3_access_key,
+                    secret_key=args.s3_secret_key,
+                )
+            else:
+                if not args.smb_server or not args.smb_share:
+                    report["skipped"]["smb"] = "--smb-server/--smb-share não informados"
+                    continue
+                factory = lambda: FileSystemFactory.create(
+                    "smb",
+                    server=args.smb_server,
+                    username=args.smb_user,
+                    password=args.smb_password,
+                    share=args.smb_share,
+                    port=args.smb_port,
+                )
+
+            report["results"].extend(
+                bench_backend(backend, factory, scenarios, args.chunk_sizes, args.concurrency, args.remote_root, work_dir)
+            )
+    finally:
+        if owns_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report["finished_at"] = datetime.now(tz=UTC).isoformat()
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return 1 if any(r["error"] for r in report["results"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
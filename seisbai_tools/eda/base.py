@@ -1,8 +1,12 @@
+from typing import Self
+
 from ulid import ULID, new as newULID
 from msgspec import Struct, field
 
+from ..pub_sub import PubSub
 from ..pub_sub.mixins import AutoPublishMixin
 from ..eda.mixins import AutoLoggerMixin
+from ..utils.get_class_type import register_class_path
 
 
 class Base(Struct, AutoPublishMixin, AutoLoggerMixin, frozen=True, kw_only=True):
@@ -37,10 +41,24 @@ class Base(Struct, AutoPublishMixin, AutoLoggerMixin, frozen=True, kw_only=True)
     _id: ULID = field(default_factory=lambda: newULID())
     message: str = field(default="")
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Comandos/eventos são resolvidos por `get_type` sem importlib
+        register_class_path(cls)
+
     def __post_init__(self):
         AutoPublishMixin.__post_init__(self)
         AutoLoggerMixin.__post_init__(self)
 
+    @classmethod
+    def construct_silently(cls, **kwargs) -> Self:
+        """
+        Constrói a instância sem publicar nem registrar log. Para emitir
+        depois, use `PubSub().publish_many([...])`.
+        """
+        with PubSub().suppressed():
+            return cls(**kwargs)
+
     @property
     def id(self):
         return self._id
@@ -0,0 +1,4 @@
+from .log_io import LogAppender, LogFormat, LogReader, LogRecord
+from .writer import BackgroundLogWriter
+from .rotation import RotatingLogAppender, RotationPolicy, read_session
+from .policy import LogMode, LogPolicy, get_log_policy, load_log_policies_from_env, reset_log_policies, set_log_policy, should_log
@@ -0,0 +1,308 @@
+import gzip
+import io
+import mmap
+import os
+import struct
+from datetime import datetime
+from enum import Enum
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Set, Union
+
+import msgspec
+from ulid import ULID, from_str
+
+from ...pub_sub import PubSub
+from ...utils.get_class_type import get_type
+from ...utils.utc import as_utc
+
+# Arquivos msgpack começam com esta assinatura; NDJSON começa com "{"
+MSGPACK_MAGIC = b"SBLOG1\n"
+
+_LENGTH = struct.Struct(">I")
+
+
+class LogFormat(str, Enum):
+    NDJSON = "ndjson"    # uma entrada JSON por linha (formato do AutoLoggerMixin)
+    MSGPACK = "msgpack"  # assinatura + frames [tamanho (4 bytes) + msgpack]
+
+
+class LogRecord(msgspec.Struct, frozen=True):
+    """
+    Entrada do log de sessão, no formato escrito pelo `AutoLoggerMixin`.
+
+    `data` guarda os campos da mensagem; `event()` reconstrói a instância
+    tipada (sem publicar nem registrar log).
+    """
+    timestamp: str
+    id: str
+    name: str
+    data: Dict[str, Any] = {}
+    type: Optional[str] = None   # caminho completo da classe, quando conhecido
+
+    @property
+    def time(self) -> datetime:
+        return as_utc(datetime.fromisoformat(self.timestamp))
+
+    def event(self) -> Any:
+        if not self.type:
+            raise ValueError(f"Record {self.id} ({self.name}) has no type path")
+        with PubSub().suppressed():
+            return msgspec.convert(self.data, get_type(self.type), strict=False, dec_hook=_dec_hook)
+
+
+def _dec_hook(cls: type, obj: Any) -> Any:
+    if cls is ULID and isinstance(obj, str):
+        return from_str(obj)
+    raise NotImplementedError(f"Objects of type {cls} are not supported")
+
+
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_SUFFIXES)
+
+
+def open_log(path: str) -> BinaryIO:
+    """Abre um log para leitura, descomprimindo segmentos `.gz`/`.zst` em streaming."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if path.endswith(".zst"):
+        import zstandard
+        raw = open(path, "rb")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))  # type: ignore[arg-type]
+    return open(path, "rb")
+
+
+def detect_format(path: str) -> LogFormat:
+    with open_log(path) as f:
+        head = f.read(len(MSGPACK_MAGIC))
+    return LogFormat.MSGPACK if head == MSGPACK_MAGIC else LogFormat.NDJSON
+
+
+# --------------------------------------------------
+# ESCRITA
+# --------------------------------------------------
+
+class LogAppender:
+    """
+    Escritor de log com buffer e handle de arquivo de longa duração.
+
+    Entradas se acumulam em memória e vão ao disco quando o buffer passa de
+    `buffer_size` bytes, em `flush()` ou ao fechar. Não é thread-safe: quem
+    compartilha um appender entre threads serializa as chamadas.
+
+    Parameters
+    ----------
+    path : str
+        Arquivo de destino (aberto em modo append; diretórios são criados).
+    format : LogFormat
+        NDJSON (padrão, compatível com `grep`) ou MSGPACK (mais compacto).
+        Ao anexar a um arquivo existente, o formato dele prevalece.
+    buffer_size : int
+        Bytes acumulados antes de escrever.
+    """
+
+    def __init__(self, path: str, format: LogFormat = LogFormat.NDJSON, buffer_size: int = 256 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.path = path
+        self.format = detect_format(path) if exists else format
+        self.buffer_size = buffer_size
+
+        self._file: BinaryIO = open(path, "ab")
+        self._buffer = bytearray()
+        self._json = msgspec.json.Encoder(enc_hook=_enc_hook)
+        self._msgpack = msgspec.msgpack.Encoder(enc_hook=_enc_hook)
+
+        if self.format is LogFormat.MSGPACK and not exists:
+            self._buffer += MSGPACK_MAGIC
+
+    def append(self, entry: Union[Dict[str, Any], LogRecord]):
+        if self.format is LogFormat.MSGPACK:
+            body = self._msgpack.encode(entry)
+            self._buffer += _LENGTH.pack(len(body))
+            self._buffer += body
+        else:
+            self._json.encode_into(entry, self._buffer, -1)
+            self._buffer += b"\n"
+
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def append_many(self, entries: Iterable[Union[Dict[str, Any], LogRecord]]):
+        for entry in entries:
+            self.append(entry)
+
+    @property
+    def size(self) -> int:
+        """Tamanho do arquivo incluindo o que ainda está no buffer."""
+        return self._file.tell() + len(self._buffer)
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "LogAppender":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _enc_hook(obj: Any) -> Any:
+    if isinstance(obj, (ULID, datetime)):
+        return str(obj) if isinstance(obj, ULID) else obj.isoformat()
+    return repr(obj)
+
+
+# --------------------------------------------------
+# LEITURA
+# --------------------------------------------------
+
+class LogReader:
+    """
+    Leitor em streaming de logs de sessão (NDJSON ou msgpack).
+
+    O arquivo é mapeado em memória (segmentos comprimidos são lidos em
+    streaming) e percorrido entrada a entrada, então o consumo de memória
+    não depende do tamanho do log. Filtros baratos (nome
+    da classe, `correlation_id`) são aplicados sobre os bytes da linha antes
+    de decodificá-la.
+
+    Exemplo
+    -------
+    >>> reader = LogReader(path)
+    >>> for record in reader.records(types={"DownloadFailedEvent"}, start=since):
+    ...     print(record.time, record.data["file_name"])
+    >>> events = list(reader.events(correlation_id=job_id))
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = detect_format(path)
+        self._decoder_json = msgspec.json.Decoder(LogRecord)
+        self._decoder_msgpack = msgspec.msgpack.Decoder(LogRecord)
+
+    def records(
+        self,
+        types: Optional[Iterable[str]] = None,
+        correlation_id: Union[str, ULID, None] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[LogRecord]:
+        """
+        Entradas em ordem de escrita.
+
+        types : nomes de classe aceitos (ex.: {"DownloadFailedEvent"}).
+        correlation_id : só entradas com este `correlation_id`.
+        start, end : intervalo [start, end) pelo carimbo de tempo da entrada;
+            valores sem fuso são tratados como UTC.
+        """
+        names: Optional[Set[str]] = set(types) if types is not None else None
+        start = as_utc(start) if start is not None else None
+        end = as_utc(end) if end is not None else None
+        correlation = str(correlation_id) if correlation_id is not None else None
+
+        for raw in self._iter_raw():
+            # Pré-filtro nos bytes: descarta a maioria sem decodificar
+            if correlation is not None and correlation.encode() not in raw:
+                continue
+            if names is not None and not any(name.encode() in raw for name in names):
+                continue
+
+            record = self._decode(raw)
+
+            if names is not None and record.name not in names:
+                continue
+            if correlation is not None and str(record.data.get("correlation_id")) != correlation:
+                continue
+            if start is not None or end is not None:
+                time = record.time
+                if start is not None and time < start:
+                    continue
+                if end is not None and time >= end:
+                    continue
+
+            yield record
+
+    def events(self, **filters: Any) -> Iterator[Any]:
+        """Como `records`, mas devolvendo as instâncias tipadas."""
+        for record in self.records(**filters):
+            yield record.event()
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        return self.records()
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _decode(self, raw: bytes) -> LogRecord:
+        if self.format is LogFormat.MSGPACK:
+            return self._decoder_msgpack.decode(raw)
+        return self._decoder_json.decode(raw)
+
+    def _iter_raw(self) -> Iterator[bytes]:
+        if os.path.getsize(self.path) == 0:
+            return
+
+        if is_compressed(self.path):
+            with open_log(self.path) as stream:
+                if self.format is LogFormat.MSGPACK:
+                    stream.read(len(MSGPACK_MAGIC))
+                    yield from self._iter_stream_frames(stream)
+                else:
+                    # Última linha sem "\n": escrita em andamento, fica de fora
+                    yield from (line for line in stream if line.endswith(b"\n") and line.strip())
+            return
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if self.format is LogFormat.MSGPACK:
+                yield from self._iter_frames(mm)
+            else:
+                yield from self._iter_lines(mm)
+
+    @staticmethod
+    def _iter_lines(mm: mmap.mmap) -> Iterator[bytes]:
+        position, size = 0, len(mm)
+        while position < size:
+            end = mm.find(b"\n", position)
+            if end == -1:
+                break  # linha incompleta (escrita em andamento)
+            line = mm[position:end]
+            position = end + 1
+            if line.strip():
+                yield line
+
+    @staticmethod
+    def _iter_frames(mm: mmap.mmap) -> Iterator[bytes]:
+        position, size = len(MSGPACK_MAGIC), len(mm)
+        while position + _LENGTH.size <= size:
+            (length,) = _LENGTH.unpack_from(mm, position)
+            start = position + _LENGTH.size
+            if start + length > size:
+                break  # frame incompleto (escrita em andamento)
+            yield mm[start:start + length]
+            position = start + length
+
+    @staticmethod
+    def _iter_stream_frames(stream: BinaryIO) -> Iterator[bytes]:
+        while True:
+            header = stream.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(header)
+            body = stream.read(length)
+            if len(body) < length:
+                return
+            yield body
@@ -0,0 +1,174 @@
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from itertools import count
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+ENV_VAR = "SEISBAI_LOG_POLICY"
+
+# Limite de chaves acompanhadas pelo rate limit antes de recomeçar a janela
+_MAX_RATE_KEYS = 10_000
+
+
+class LogMode(str, Enum):
+    ALWAYS = "always"
+    SAMPLE = "sample"   # 1 a cada `every`
+    RATE = "rate"       # até `per_second` por correlation_id (ou por classe)
+    OFF = "off"
+
+
+@dataclass(frozen=True)
+class LogPolicy:
+    """
+    Política de log do `AutoLoggerMixin` para uma classe (e subclasses).
+
+    Exemplo
+    -------
+    >>> set_log_policy("ProgressUpdatedEvent", LogPolicy.rate(2))
+    >>> set_log_policy(DownloadProgressUpdatedEvent, LogPolicy.sample(100))
+    >>> set_log_policy("FilesListedEvent", LogPolicy.off())
+    """
+    mode: LogMode = LogMode.ALWAYS
+    every: int = 1
+    per_second: float = 0.0
+
+    @classmethod
+    def always(cls) -> "LogPolicy":
+        return cls(LogMode.ALWAYS)
+
+    @classmethod
+    def sample(cls, every: int) -> "LogPolicy":
+        return cls(LogMode.SAMPLE, every=max(1, every))
+
+    @classmethod
+    def rate(cls, per_second: float) -> "LogPolicy":
+        return cls(LogMode.RATE, per_second=per_second)
+
+    @classmethod
+    def off(cls) -> "LogPolicy":
+        return cls(LogMode.OFF)
+
+    @classmethod
+    def parse(cls, text: str) -> "LogPolicy":
+        """`always`, `off`, `sample:N` ou `rate:N` (por segundo)."""
+        mode, _, value = text.strip().lower().partition(":")
+        if mode == LogMode.SAMPLE:
+            return cls.sample(int(value))
+        if mode == LogMode.RATE:
+            return cls.rate(float(value))
+        return cls(LogMode(mode))
+
+
+class _Decision:
+    """Política já resolvida para uma classe, com o estado de amostragem."""
+    __slots__ = ("policy", "_counter", "_windows", "_lock")
+
+    def __init__(self, policy: LogPolicy):
+        self.policy = policy
+        self._counter = count()
+        self._windows: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = Lock()
+
+    def accept(self, instance: Any) -> bool:
+        mode = self.policy.mode
+        if mode is LogMode.ALWAYS:
+            return True
+        if mode is LogMode.OFF:
+            return False
+        if mode is LogMode.SAMPLE:
+            return next(self._counter) % self.policy.every == 0
+        return self._accept_rate(getattr(instance, "correlation_id", None))
+
+    def _accept_rate(self, key: Hashable) -> bool:
+        per_second = self.policy.per_second
+        if per_second <= 0:
+            return False
+
+        # Taxas abaixo de 1/s usam janelas mais longas (ex.: rate:0.2 -> 1 a cada 5 s)
+        length = max(1.0, 1.0 / per_second)
+        allowance = per_second * length
+
+        now = time.monotonic()
+        with self._lock:
+            window, used = self._windows.get(key, (now, 0))
+            if now - window >= length:
+                window, used = now, 0
+            if used >= allowance:
+                return False
+            if len(self._windows) >= _MAX_RATE_KEYS and key not in self._windows:
+                self._windows.clear()
+            self._windows[key] = (window, used + 1)
+            return True
+
+
+_policies: Dict[str, LogPolicy] = {}
+_decisions: Dict[type, _Decision] = {}
+_default = LogPolicy.always()
+_lock = Lock()
+
+
+def set_log_policy(target: Union[str, type], policy: LogPolicy):
+    """
+    Define a política de uma classe (ou nome de classe), herdada pelas
+    subclasses; `"*"` muda o padrão. Vale imediatamente para novas instâncias.
+    """
+    global _decisions, _default
+    name = target if isinstance(target, str) else target.__name__
+    with _lock:
+        if name == "*":
+            _default = policy
+        else:
+            _policies[name] = policy
+        _decisions = {}
+
+
+def reset_log_policies():
+    global _decisions, _default
+    with _lock:
+        _policies.clear()
+        _default = LogPolicy.always()
+        _decisions = {}
+
+
+def get_log_policy(cls: type) -> LogPolicy:
+    """Política efetiva: a da classe mais específica da hierarquia com política."""
+    for klass in cls.__mro__:
+        policy = _policies.get(klass.__name__)
+        if policy is not None:
+            return policy
+    return _default
+
+
+def should_log(instance: Any) -> bool:
+    """Decide, antes de qualquer serialização, se a instância vai para o log."""
+    cls = type(instance)
+    decision = _decisions.get(cls)
+    if decision is None:
+        with _lock:
+            decision = _decisions.get(cls)
+            if decision is None:
+                decision = _decisions[cls] = _Decision(get_log_policy(cls))
+    return decision.accept(instance)
+
+
+def load_log_policies_from_env(value: Optional[str] = None):
+    """
+    Lê políticas de `SEISBAI_LOG_POLICY`, no formato
+    `Classe=política,Outra=política`, ex.:
+
+        SEISBAI_LOG_POLICY="ProgressUpdatedEvent=rate:2,FilesListedEvent=off,*=always"
+    """
+    value = os.getenv(ENV_VAR, "") if value is None else value
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, policy = item.partition("=")
+        try:
+            set_log_policy(name.strip(), LogPolicy.parse(policy))
+        except ValueError as error:
+            print(f"[AutoLogger] Ignoring invalid log policy {item!r}: {error}")
+
+
+load_log_policies_from_env()
@@ -0,0 +1,308 @@
+import gzip
+import json
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from threading import Lock, Thread
+from typing import Any, Dict, Iterator, List, Optional
+
+from .log_io import LogAppender, LogFormat, LogReader, LogRecord
+
+
+@dataclass
+class RotationPolicy:
+    """
+    Política de rotação e retenção do log de sessão.
+
+    Attributes:
+        max_bytes (int): Tamanho que fecha o segmento ativo (0 = sem limite).
+        max_age_seconds (float): Idade que fecha o segmento ativo (0 = sem limite).
+        compress (bool): Comprime segmentos fechados em background (zstd se
+            o pacote `zstandard` estiver instalado; senão gzip).
+        max_segments (int): Segmentos fechados mantidos (0 = todos).
+        max_total_bytes (int): Espaço máximo dos segmentos fechados (0 = sem limite).
+        max_age_days (float): Remove segmentos mais antigos que isso (0 = nunca).
+    """
+    max_bytes: int = 128 * 1024 * 1024
+    max_age_seconds: float = 24 * 3600
+    compress: bool = True
+    max_segments: int = 0
+    max_total_bytes: int = 0
+    max_age_days: float = 0
+
+
+@dataclass
+class Segment:
+    """Entrada do índice: um segmento fechado e seu intervalo de tempo."""
+    file: str
+    first: Optional[str] = None   # timestamp ISO da primeira entrada
+    last: Optional[str] = None    # timestamp ISO da última entrada
+    entries: int = 0
+    bytes: int = 0
+    compressed: bool = False
+    closed_at: float = field(default_factory=time.time)
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        if self.first is None or self.last is None:
+            return True
+        if start is not None and datetime.fromisoformat(self.last) < start:
+            return False
+        if end is not None and datetime.fromisoformat(self.first) >= end:
+            return False
+        return True
+
+
+def index_path(path: str) -> str:
+    return f"{path}.index.json"
+
+
+def load_index(path: str) -> List[Segment]:
+    try:
+        with open(index_path(path), "r", encoding="utf-8") as f:
+            return [Segment(**item) for item in json.load(f)]
+    except FileNotFoundError:
+        return []
+
+
+def _save_index(path: str, segments: List[Segment]):
+    temp = index_path(path) + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump([asdict(segment) for segment in segments], f, indent=1)
+    os.replace(temp, index_path(path))
+
+
+def _compressor():
+    """`(sufixo, função(origem, destino))` do melhor compressor disponível."""
+    try:
+        import zstandard
+    except ImportError:
+        def gzip_file(source: str, target: str):
+            with open(source, "rb") as src, gzip.open(target, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        return ".gz", gzip_file
+
+    def zstd_file(source: str, target: str):
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            zstandard.ZstdCompressor(level=6).copy_stream(src, dst)
+    return ".zst", zstd_file
+
+
+class RotatingLogAppender:
+    """
+    `LogAppender` com rotação por tamanho/idade, compressão e retenção.
+
+    O segmento ativo é sempre `path`. Ao rotacionar, ele vira
+    `path.000001` (numeração crescente), é registrado no índice
+    `path.index.json` com o intervalo de tempo das entradas e, se configurado,
+    comprimido em uma thread separada. A retenção remove os segmentos mais
+    antigos; o ativo nunca é removido.
+
+    Para ler um intervalo sem percorrer a sessão inteira, use
+    `read_session(path, start=..., end=...)`, que consulta o índice.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        policy: Optional[RotationPolicy] = None,
+        format: LogFormat = LogFormat.NDJSON,
+        buffer_size: int = 256 * 1024,
+    ):
+        self.path = path
+        self.policy = policy or RotationPolicy()
+        self.format = format
+        self.buffer_size = buffer_size
+
+        self._index_lock = Lock()
+        self._compressions: List[Thread] = []
+        self._open()
+
+    # --------------------------------------------------
+    # API
+    # --------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]):
+        if self._should_rotate():
+            self.rotate()
+
+        self._appender.append(entry)
+
+        timestamp = entry.get("timestamp") if isinstance(entry, dict) else getattr(entry, "timestamp", None)
+        if timestamp is not None:
+            if self._first is None:
+                self._first = timestamp
+            self._last = timestamp
+        self._entries += 1
+
+    def flush(self):
+        self._appender.flush()
+
+    def rotate(self):
+        """Fecha o segmento ativo, registra no índice e aplica a retenção."""
+        self._appender.close()
+
+        if self._entries == 0 or os.path.getsize(self.path) == 0:
+            self._open()
+            return
+
+        segment_file = f"{self.path}.{self._next_number():06d}"
+        os.replace(self.path, segment_file)
+
+        segment = Segment(
+            file=os.path.basename(segment_file),
+            first=self._first,
+            last=self._last,
+            entries=self._entries,
+            bytes=os.path.getsize(segment_file),
+        )
+        with self._index_lock:
+            segments = load_index(self.path)
+            segments.append(segment)
+            _save_index(self.path, segments)
+
+        self._open()
+
+        if self.policy.compress:
+            thread = Thread(target=self._compress, args=(segment.file,), name="LogSegmentCompressor", daemon=True)
+            self._compressions = [t for t in self._compressions if t.is_alive()] + [thread]
+            thread.start()
+        else:
+            self._apply_retention()
+
+    def close(self, timeout: Optional[float] = 30.0):
+        self._appender.close()
+        for thread in self._compressions:
+            thread.join(timeout=timeout)
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _open(self):
+        self._appender = LogAppender(self.path, self.format, self.buffer_size)
+        self._opened_at = time.time()
+        self._first: Optional[str] = None
+        self._last: Optional[str] = None
+        self._entries = 0
+
+        # Segmento ativo herdado de uma execução anterior: conta como aberto
+        # desde a última modificação, e o tamanho já existente vale
+        if os.path.getsize(self.path) > 0:
+            self._opened_at = os.path.getmtime(self.path)
+            self._entries = 1
+
+    def _should_rotate(self) -> bool:
+        policy = self.policy
+        if policy.max_bytes and self._appender.size >= policy.max_bytes:
+            return True
+        if policy.max_age_seconds and self._entries and time.time() - self._opened_at >= policy.max_age_seconds:
+            return True
+        return False
+
+    def _next_number(self) -> int:
+        # Pelo diretório, não pelo índice: a retenção pode ter removido entradas
+        prefix = os.path.basename(self.path) + "."
+        numbers = [
+            int(name[len(prefix):].split(".")[0])
+            for name in os.listdir(os.path.dirname(self.path) or ".")
+            if name.startswith(prefix) and name[len(prefix):].split(".")[0].isdigit()
+        ]
+        return max(numbers, default=0) + 1
+
+    def _compress(self, name: str):
+        directory = os.path.dirname(self.path)
+        source = os.path.join(directory, name)
+        suffix, compress = _compressor()
+        target = source + suffix
+
+        try:
+            compress(source, target + ".tmp")
+        except FileNotFoundError:
+            return  # removido pela retenção antes da compressão
+        except Exception as error:
+            print(f"[AutoLogger] Error compressing {source}: {error}")
+            self._remove_quietly(target + ".tmp")
+            return
+
+        with self._index_lock:
+            segments = load_index(self.path)
+            current = next((s for s in segments if s.file == name), None)
+
+            # A retenção pode ter descartado o segmento durante a compressão
+            if current is None:
+                self._remove_quietly(target + ".tmp")
+                self._remove_quietly(source)
+                return
+
+            os.replace(target + ".tmp", target)
+            self._remove_quietly(source)
+            current.file = os.path.basename(target)
+            current.bytes = os.path.getsize(target)
+            current.compressed = True
+            _save_index(self.path, segments)
+
+        self._apply_retention()
+
+    def _apply_retention(self):
+        policy = self.policy
+        if not (policy.max_segments or policy.max_total_bytes or policy.max_age_days):
+            return
+
+        directory = os.path.dirname(self.path)
+        with self._index_lock:
+            segments = load_index(self.path)
+            kept = list(segments)
+
+            if policy.max_age_days:
+                limit = time.time() - policy.max_age_days * 86400
+                kept = [s for s in kept if s.closed_at >= limit]
+            if policy.max_segments:
+                kept = kept[-policy.max_segments:]
+            if policy.max_total_bytes:
+                while kept and sum(s.bytes for s in kept) > policy.max_total_bytes:
+                    kept.pop(0)
+
+            for segment in segments:
+                if segment not in kept:
+                    self._remove_quietly(os.path.join(directory, segment.file))
+
+            if len(kept) != len(segments):
+                _save_index(self.path, kept)
+
+    @staticmethod
+    def _remove_quietly(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# --------------------------------------------------
+# LEITURA
+# --------------------------------------------------
+
+def read_session(
+    path: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    **filters: Any,
+) -> Iterator[LogRecord]:
+    """
+    Percorre um log rotacionado (segmentos do índice + segmento ativo) em
+    ordem, pulando pelo índice os segmentos fora de [start, end).
+    """
+    directory = os.path.dirname(path)
+    files = [
+        os.path.join(directory, segment.file)
+        for segment in load_index(path)
+        if segment.overlaps(start, end)
+    ]
+    if os.path.exists(path):
+        files.append(path)
+
+    for file in files:
+        if not os.path.exists(file):
+            continue  # removido pela retenção durante a leitura
+        yield from LogReader(file).records(start=start, end=end, **filters)
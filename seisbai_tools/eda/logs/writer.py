@@ -0,0 +1,194 @@
+import atexit
+import os
+import time
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Optional
+
+from .rotation import RotatingLogAppender, RotationPolicy
+
+
+class _Barrier:
+    """Marcador na fila: sinaliza quando tudo antes dele foi escrito."""
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = Event()
+
+
+class _Configure:
+    __slots__ = ("rotation",)
+
+    def __init__(self, rotation: RotationPolicy):
+        self.rotation = rotation
+
+
+_STOP = object()
+
+
+class BackgroundLogWriter:
+    """
+    Escrita de log em background, em lote, para o `AutoLoggerMixin`.
+
+    Quem constrói a mensagem apenas enfileira `(arquivo, entrada)` em uma
+    `SimpleQueue` (sem lock do lado do produtor); uma thread daemon drena a
+    fila em lotes e escreve por `LogAppender`s mantidos abertos. Os dados vão
+    ao disco a cada `flush_interval` segundos ou quando o buffer de um
+    arquivo passa de `buffer_size` bytes, e a fila é drenada na saída do
+    processo. Cada arquivo é rotacionado, comprimido e podado conforme a
+    `RotationPolicy` (ver `configure`).
+
+    Use `BackgroundLogWriter.instance()`: há um escritor por processo (um
+    processo filho criado por fork ganha o seu).
+    """
+
+    _instance: Optional["BackgroundLogWriter"] = None
+    _instance_pid: Optional[int] = None
+    _instance_lock = Lock()
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        buffer_size: int = 256 * 1024,
+        max_batch: int = 4096,
+        rotation: Optional[RotationPolicy] = None,
+    ):
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.max_batch = max_batch
+        self.rotation = rotation or RotationPolicy()
+
+        self._queue: "SimpleQueue[Any]" = SimpleQueue()
+        self._appenders: Dict[str, RotatingLogAppender] = {}
+        self._closed = False
+
+        self._thread = Thread(target=self._run, name="AutoLoggerWriter", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def instance(cls) -> "BackgroundLogWriter":
+        pid = os.getpid()
+        if cls._instance is None or cls._instance_pid != pid:
+            with cls._instance_lock:
+                if cls._instance is None or cls._instance_pid != pid:
+                    cls._instance = cls()
+                    cls._instance_pid = pid
+                    atexit.register(cls._instance.close)
+        return cls._instance
+
+    # --------------------------------------------------
+    # API
+    # --------------------------------------------------
+
+    def configure(self, rotation: RotationPolicy):
+        """Troca a política de rotação; vale para os arquivos abertos a partir daqui."""
+        self._queue.put(_Configure(rotation))
+
+    def write(self, path: str, entry: Dict[str, Any]):
+        self._queue.put((path, entry))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a escrita (em disco) de tudo o que foi enfileirado até aqui."""
+        if self._closed:
+            return True
+        barrier = _Barrier()
+        self._queue.put(barrier)
+        return barrier.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Drena a fila, fecha os arquivos e encerra a thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            stop = False
+            barriers = []
+            count = 0
+
+            # Drena o que já está na fila sem bloquear, até `max_batch`
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _Barrier):
+                    barriers.append(item)
+                elif isinstance(item, _Configure):
+                    self._reconfigure(item.rotation)
+                else:
+                    self._append(*item)
+                    count += 1
+
+                if stop or count >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    item = None
+
+            if barriers or stop or time.monotonic() >= next_flush:
+                self._flush_all()
+                next_flush = time.monotonic() + self.flush_interval
+
+            for barrier in barriers:
+                barrier.done.set()
+
+            if stop:
+                self._drain_remaining()
+                return
+
+    def _append(self, path: str, entry: Dict[str, Any]):
+        try:
+            appender = self._appenders.get(path)
+            if appender is None:
+                appender = self._appenders[path] = RotatingLogAppender(path, self.rotation, buffer_size=self.buffer_size)
+            appender.append(entry)
+        except Exception as error:
+            print(f"[AutoLogger] Error writing {path}: {error}")
+
+    def _reconfigure(self, rotation: RotationPolicy):
+        self.rotation = rotation
+        for appender in self._appenders.values():
+            appender.policy = rotation
+
+    def _flush_all(self):
+        for path, appender in list(self._appenders.items()):
+            try:
+                appender.flush()
+            except OSError as error:
+                print(f"[AutoLogger] Error flushing {path}: {error}")
+
+    def _drain_remaining(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if isinstance(item, _Barrier):
+                item.done.set()
+            elif isinstance(item, _Configure):
+                self._reconfigure(item.rotation)
+            elif item is not _STOP:
+                self._append(*item)
+
+        for appender in self._appenders.values():
+            try:
+                appender.close()
+            except OSError:
+                pass
+        self._appenders.clear()
+
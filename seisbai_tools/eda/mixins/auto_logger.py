@@ -1,56 +1,71 @@
-from datetime import datetime
 import os
 import socket
-from threading import Lock
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+import msgspec
 
-from msgspec import json
 from ...pub_sub import PubSub
 from ...utils.get_log_dir import get_default_log_dir
+from ...utils.import_path import get_import_path
+from ...utils.ndarray import array_to_json, is_ndarray
+from ..logs.policy import should_log
+from ..logs.writer import BackgroundLogWriter
 from ulid import ULID
 
-_file_locks: Dict[str, Lock] = {}
-
-def _safe_serialize(value: Any):
-    """Converte tipos não nativos para string"""
+def _enc_hook(value: Any) -> Any:
+    """Tipos que o msgspec não converte sozinho (UUID e datetime são nativos)"""
     if isinstance(value, ULID):
         return str(value)
-    elif isinstance(value, datetime):
-        return value.isoformat()
-    elif isinstance(value, (int, float, str, bool, type(None))):
-        return value
-    else:
-        return repr(value)
-
-def _to_dict(element: Any):
-    """Cria dict serializável da instância (funciona com msgspec.Struct)"""
-    fields = getattr(element, "__struct_fields__", [])
-    return {k: _safe_serialize(getattr(element, k)) for k in fields}
-
-def _write_log(file_path: str, entry: Dict[str, Any]):
-    if file_path not in _file_locks:
-        _file_locks[file_path] = Lock()
-    
-    lock = _file_locks[file_path]
-
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    with lock:
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(json.encode(entry).decode("utf-8") + "\n")
+    if is_ndarray(value):
+        return array_to_json(value)
+    # Último recurso, fora do caminho comum: tipos desconhecidos
+    return repr(value)
+
+
+def _to_dict(element: Any) -> Dict[str, Any]:
+    """
+    Campos da instância como tipos nativos, em C (`msgspec.to_builtins`).
+    Structs aninhados (DTOs, `FileSystemPathInfo`) viram dicts estruturados.
+    """
+    return msgspec.to_builtins(element, enc_hook=_enc_hook, str_keys=True)
+
+# Caminho do log por diretório, calculado uma vez por processo
+# (hostname e sessão não mudam; um fork recalcula)
+_log_files: Dict[Optional[str], str] = {}
+_log_files_pid: Optional[int] = None
+
+
+def _log_file(log_dir: Optional[str]) -> str:
+    global _log_files_pid
+
+    if _log_files_pid != os.getpid():
+        _log_files.clear()
+        _log_files_pid = os.getpid()
+
+    path = _log_files.get(log_dir)
+    if path is None:
+        directory = log_dir or get_default_log_dir()
+        path = os.path.join(directory, f"{PubSub().session()}_{socket.gethostname()}.log")
+        _log_files[log_dir] = path
+    return path
+
 
 class AutoLoggerMixin:
     def __post_init__(self):
-        log_dir = getattr(self, "log_dir", get_default_log_dir())
-        hostname = socket.gethostname()
-        session = PubSub().session()
-        log_file = os.path.join(log_dir, f"{session}_{hostname}.log")
+        if PubSub.is_suppressed():
+            return
+
+        # A política decide antes de montar a entrada: descartes não serializam
+        if not should_log(self):
+            return
 
         entry = {
             "timestamp": getattr(self, "timestamp").isoformat(),
             "id": str(getattr(self, "id", None)),
             "name": self.__class__.__name__,
+            "type": get_import_path(self.__class__),
             "data": _to_dict(self)
         }
 
-        _write_log(log_file, entry)
\ No newline at end of file
+        # Só enfileira: a escrita em lote acontece na thread do escritor
+        BackgroundLogWriter.instance().write(_log_file(getattr(self, "log_dir", None)), entry)
@@ -0,0 +1,398 @@
+import os
+import sqlite3
+import time
+from datetime import datetime
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread, local
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ulid import ULID
+
+from ...pub_sub import PubSub
+from ...types import Args
+from ...utils.codec import decode, encode
+from ...utils.import_path import get_import_path
+from ...utils.utc import as_utc
+from ..base import Base
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT NOT NULL UNIQUE,      -- ULID em texto
+    ts INTEGER NOT NULL,          -- milissegundos desde a época (do ULID)
+    name TEXT NOT NULL,           -- nome da classe
+    type TEXT NOT NULL,           -- caminho completo da classe
+    correlation_id TEXT,
+    causation_id TEXT,
+    payload BLOB NOT NULL         -- envelope de `utils.codec`
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_correlation ON events (correlation_id, ts);
+CREATE INDEX IF NOT EXISTS events_causation ON events (causation_id, ts);
+CREATE INDEX IF NOT EXISTS events_name ON events (name, ts);
+"""
+
+_INSERT = (
+    "INSERT OR IGNORE INTO events (id, ts, name, type, correlation_id, causation_id, payload)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_Row = Tuple[str, int, str, str, Optional[str], Optional[str], bytes]
+
+
+class _Barrier:
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = Event()
+
+
+_STOP = object()
+
+
+def _text(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def _millis(value: datetime) -> int:
+    # Sem fuso = UTC, como em `LogReader.records` (não o fuso local)
+    return int(as_utc(value).timestamp() * 1000)
+
+
+class EventStore:
+    """
+    Armazenamento embutido (SQLite) de comandos e eventos publicados.
+
+    Cada mensagem é gravada uma vez (o ULID é único; repetições são
+    ignoradas) com índices por tempo, classe, `correlation_id` e
+    `causation_id`, o que permite reconstruir uma saga sem percorrer logs.
+    A gravação acontece em uma thread própria, em transações por lote: quem
+    publica apenas codifica a mensagem e a enfileira. A codificação é feita
+    na hora da publicação, então alterações posteriores na instância não
+    chegam ao registro.
+
+    Com `attach()`, o store passa a receber tudo o que é publicado no
+    `PubSub` do processo (inclusive o que chega por uma `PubSubBridge`).
+
+    Exemplo
+    -------
+    >>> store = EventStore("/data/events.db").attach()
+    >>> flow = list(store.events(correlation_id=job_id))
+    >>> store.replay(correlation_id=job_id, speed=10.0)   # 10x mais rápido
+    """
+
+    def __init__(self, path: str, batch_size: int = 1024, pub_sub: Optional[PubSub] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.batch_size = batch_size
+        self.pub_sub = pub_sub or PubSub()
+
+        self._local = local()
+        self._connections: List[sqlite3.Connection] = []
+        self._queue: "SimpleQueue[Any]" = SimpleQueue()
+        self._attached = False
+        self._closed = False
+        self._lock = Lock()
+
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.commit()
+
+        self._thread = Thread(target=self._run, name="EventStoreWriter", daemon=True)
+        self._thread.start()
+
+    # --------------------------------------------------
+    # GRAVAÇÃO
+    # --------------------------------------------------
+
+    def attach(self) -> "EventStore":
+        """Grava tudo o que for publicado no `PubSub` a partir daqui."""
+        with self._lock:
+            if not self._attached:
+                self.pub_sub.add_forwarder(self._on_publish)
+                self._attached = True
+        return self
+
+    def detach(self):
+        with self._lock:
+            if self._attached:
+                self.pub_sub.remove_forwarder(self._on_publish)
+                self._attached = False
+
+    def record(self, message: Base):
+        self._enqueue(message)
+
+    def record_many(self, messages: Iterable[Base]):
+        for message in messages:
+            self._enqueue(message)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a gravação de tudo o que foi enfileirado até aqui."""
+        if self._closed:
+            return True
+        barrier = _Barrier()
+        self._queue.put(barrier)
+        return barrier.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Grava o que falta e fecha as conexões de todas as threads."""
+        if self._closed:
+            return
+        self.detach()
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --------------------------------------------------
+    # CONSULTA
+    # --------------------------------------------------
+
+    def events(
+        self,
+        correlation_id: Union[str, ULID, None] = None,
+        causation_id: Union[str, ULID, None] = None,
+        types: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Mensagens em ordem de tempo (no mesmo milissegundo, na ordem de
+        gravação), reconstruídas sem publicar.
+
+        types : nomes de classe aceitos (ex.: {"DownloadFailedEvent"}).
+        start, end : intervalo [start, end) pelo tempo do ULID; valores sem fuso
+            são tratados como UTC.
+        """
+        for _, payload in self._select(correlation_id, causation_id, types, start, end, limit):
+            yield decode(payload)
+
+    def flow(self, correlation_id: Union[str, ULID]) -> List[Any]:
+        """Todas as mensagens de uma saga/fluxo, em ordem."""
+        return list(self.events(correlation_id=correlation_id))
+
+    def caused_by(self, message_id: Union[str, ULID]) -> List[Any]:
+        """Mensagens causadas diretamente por `message_id`."""
+        return list(self.events(causation_id=message_id))
+
+    def count(self, **filters: Any) -> int:
+        where, params = self._where(**filters)
+        row = self._connect().execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()
+        return row[0]
+
+    # --------------------------------------------------
+    # REPLAY
+    # --------------------------------------------------
+
+    def replay(
+        self,
+        speed: float = 1.0,
+        stop: Optional[Event] = None,
+        **filters: Any,
+    ) -> int:
+        """
+        Republica no `PubSub` as mensagens selecionadas (mesmos filtros de
+        `events`), preservando os intervalos originais divididos por `speed`
+        (`speed=0`: sem espera). Útil para testar carga dos handlers com
+        tráfego real. Retorna quantas mensagens foram publicadas.
+
+        Os ULIDs originais são mantidos: se o store estiver anexado, o replay
+        não duplica registros. Encaminhadores (ex.: bridges) também recebem
+        as mensagens.
+        """
+        published = 0
+        batch: List[Any] = []
+        origin: Optional[Tuple[int, float]] = None
+
+        for ts, payload in self._select(**filters):
+            if stop is not None and stop.is_set():
+                break
+
+            if speed > 0:
+                if origin is None:
+                    origin = (ts, time.monotonic())
+                due = origin[1] + (ts - origin[0]) / 1000.0 / speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    published += self._publish(batch)
+                    if stop is not None:
+                        if stop.wait(delay):
+                            break
+                    else:
+                        time.sleep(delay)
+
+            batch.append(decode(payload))
+            if len(batch) >= self.batch_size:
+                published += self._publish(batch)
+
+        return published + self._publish(batch)
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        # Uma conexão por thread; WAL permite ler enquanto o escritor grava.
+        # Todas ficam registradas para que `close` as feche (por isso podem
+        # ser fechadas de outra thread)
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _on_publish(self, path: Any, args: Args):
+        if args and isinstance(args[0], Base):
+            self._enqueue(args[0])
+
+    def _enqueue(self, message: Base):
+        # Codifica já na thread de quem publica: o estado gravado é o do momento
+        try:
+            row = self._row(message)
+        except Exception as error:
+            print(f"[EventStore] Error encoding {type(message).__name__}: {error}")
+            return
+        self._queue.put(row)
+
+    def _publish(self, batch: List[Any]) -> int:
+        if not batch:
+            return 0
+        self.pub_sub.publish_many(batch)
+        count = len(batch)
+        batch.clear()
+        return count
+
+    @staticmethod
+    def _where(
+        correlation_id: Union[str, ULID, None] = None,
+        causation_id: Union[str, ULID, None] = None,
+        types: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if correlation_id is not None:
+            clauses.append("correlation_id = ?")
+            params.append(str(correlation_id))
+        if causation_id is not None:
+            clauses.append("causation_id = ?")
+            params.append(str(causation_id))
+        if types is not None:
+            names = list(types)
+            clauses.append(f"name IN ({', '.join('?' * len(names))})")
+            params.extend(names)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_millis(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(_millis(end))
+
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _select(
+        self,
+        correlation_id: Union[str, ULID, None] = None,
+        causation_id: Union[str, ULID, None] = None,
+        types: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        where, params = self._where(correlation_id, causation_id, types, start, end)
+        sql = f"SELECT ts, payload FROM events{where} ORDER BY ts, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        # Cursor em streaming: o resultado não é carregado inteiro na memória
+        yield from self._connect().execute(sql, params)
+
+    @staticmethod
+    def _row(message: Base) -> _Row:
+        return (
+            str(message.id),
+            message.id.timestamp().int,
+            type(message).__name__,
+            get_import_path(type(message)),
+            _text(getattr(message, "correlation_id", None)),
+            _text(getattr(message, "causation_id", None)),
+            encode(message),
+        )
+
+    def _run(self):
+        connection = self._connect()
+
+        while True:
+            item = self._queue.get()
+            stop = False
+            barriers: List[_Barrier] = []
+            rows: List[_Row] = []
+
+            # Drena o que já está na fila, até `batch_size` por transação
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _Barrier):
+                    barriers.append(item)
+                else:
+                    rows.append(item)
+
+                if stop or len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    item = None
+
+            if rows:
+                try:
+                    with connection:
+                        connection.executemany(_INSERT, rows)
+                except sqlite3.Error as error:
+                    print(f"[EventStore] Error writing {len(rows)} events: {error}")
+
+            for barrier in barriers:
+                barrier.done.set()
+
+            if stop:
+                self._drain_remaining(connection)
+                return
+
+    def _drain_remaining(self, connection: sqlite3.Connection):
+        rows: List[_Row] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if isinstance(item, _Barrier):
+                item.done.set()
+            elif item is not _STOP:
+                rows.append(item)
+
+        if rows:
+            with connection:
+                connection.executemany(_INSERT, rows)
@@ -1 +1,3 @@
-from .manager import FileSystemManager
\ No newline at end of file
+from .manager import FileSystemManager
+from .sync_planner import SyncPlan, SyncPlanner
+from .write_behind import WriteBehindUploader, WriteBehindError
\ No newline at end of file
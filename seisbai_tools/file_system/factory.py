@@ -10,5 +10,8 @@ class FileSystemFactory:
         elif backend == "smb":
             from .systems.smb import SMBClient
             return SMBClient(**kwargs)  # ex: server="host", username="user", password="pass", share="share"
+        elif backend == "s3":
+            from .systems.s3 import S3Client
+            return S3Client(**kwargs)  # ex: bucket="datasets", endpoint_url="http://minio:9000", access_key="...", secret_key="..."
         else:
             raise ValueError(f"Unknown service: {backend}")
\ No newline at end of file
@@ -1,6 +1,9 @@
+import os
+import tempfile
 from abc import abstractmethod, ABC
-from typing import Iterator, Optional, List
+from typing import Iterable, Iterator, Optional, List, Tuple
 from .types import ProgressCallback, SyncMode, SyncProgressCallback, RemoteFileInfo
+from .sync_planner import SyncPlan, SyncPlanner
 
 
 class FileSystemInterface(ABC):
@@ -18,6 +21,25 @@ class FileSystemInterface(ABC):
     ):
         ...
 
+    def upload_bytes(
+            self,
+            data: bytes,
+            remote_path: str,
+            chunk_size: int = 1024 * 1024,
+            progress_callback: Optional[ProgressCallback] = None
+    ):
+        """
+        Envia um buffer em memória para `remote_path`. Backends que escrevem
+        direto do buffer sobrescrevem; o padrão passa por um arquivo temporário.
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            self.upload(temp_path, remote_path, chunk_size, progress_callback)
+        finally:
+            os.remove(temp_path)
+
     @abstractmethod
     def download(
             self,
@@ -49,6 +71,26 @@ class FileSystemInterface(ABC):
     def delete(self, path: str):
         ...
 
+    @abstractmethod
+    def copy(self, src: str, dst: str):
+        """Copia `src` para `dst` no próprio servidor, sem trafegar dados pelo client."""
+        ...
+
+    @abstractmethod
+    def move(self, src: str, dst: str):
+        """Move/renomeia `src` para `dst` no próprio servidor."""
+        ...
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]]):
+        """Cópia em lote de pares `(src, dst)`. Backends podem paralelizar."""
+        for src, dst in pairs:
+            self.copy(src, dst)
+
+    def move_many(self, pairs: Iterable[Tuple[str, str]]):
+        """Movimentação em lote de pares `(src, dst)`. Backends podem paralelizar."""
+        for src, dst in pairs:
+            self.move(src, dst)
+
     @abstractmethod
     def close(self):
         ...
@@ -64,6 +106,12 @@ class FileSystemInterface(ABC):
         mode: SyncMode = SyncMode.BIDIRECTIONAL,
         chunk_size: int = 1024 * 1024,
         progress: Optional[SyncProgressCallback] = None,
-        dry_run: bool = False
-):
+        dry_run: bool = False,
+        planner: Optional[SyncPlanner] = None,
+    ) -> SyncPlan:
+        """
+        Sincroniza `local_base` e `remote_base` segundo o plano do `planner`
+        (padrão: `SyncPlanner()`). Retorna o plano executado; com `dry_run`,
+        nada é transferido e o plano traz a estimativa de bytes e tempo.
+        """
         ...
\ No newline at end of file
@@ -1,9 +1,10 @@
-from typing import Optional, Iterator, List
+from typing import Iterable, Optional, Iterator, List, Tuple
 
 from msgspec import Struct, field
 from seisbai_tools.file_system.factory import FileSystemFactory
 from seisbai_tools.file_system.interface import FileSystemInterface
 from .types import ProgressCallback, SyncMode, SyncProgressCallback, RemoteFileInfo
+from .sync_planner import SyncPlan, SyncPlanner
 
 
 # -------------------------------------------------
@@ -61,6 +62,20 @@ class FileSystemManager(FileSystemInterface):
             progress_callback
         )
 
+    def upload_bytes(
+        self,
+        data: bytes,
+        remote_path: str,
+        chunk_size: int = 1024 * 1024,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        self.client.upload_bytes(
+            data,
+            remote_path,
+            chunk_size,
+            progress_callback
+        )
+
     # -------------------------
     def download(
         self,
@@ -102,6 +117,19 @@ class FileSystemManager(FileSystemInterface):
     def list_files_recursive(self, base_path: str) -> List[RemoteFileInfo]:
         return self.client.list_files_recursive(base_path)
 
+    # -------------------------
+    def copy(self, src: str, dst: str):
+        self.client.copy(src, dst)
+
+    def move(self, src: str, dst: str):
+        self.client.move(src, dst)
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]]):
+        self.client.copy_many(pairs)
+
+    def move_many(self, pairs: Iterable[Tuple[str, str]]):
+        self.client.move_many(pairs)
+
     # -------------------------------------------------
     def sync(
         self,
@@ -111,7 +139,8 @@ class FileSystemManager(FileSystemInterface):
         chunk_size: int = 1024 * 1024,
         progress: Optional[SyncProgressCallback] = None,
         dry_run: bool = False,
-    ):
+        planner: Optional[SyncPlanner] = None,
+    ) -> SyncPlan:
         """
         Sincroniza diretórios usando a implementação do backend.
 
@@ -119,11 +148,12 @@ class FileSystemManager(FileSystemInterface):
         Apenas delega para o client.
         """
 
-        self.client.sync(
+        return self.client.sync(
             local_base=local_base,
             remote_base=remote_base,
             mode=mode,
             chunk_size=chunk_size,
             progress=progress,
             dry_run=dry_run,
+            planner=planner,
         )
\ No newline at end of file
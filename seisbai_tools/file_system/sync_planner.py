@@ -0,0 +1,318 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .types import ConflictPolicy, ProgressCallback, RemoteFileInfo, SyncMode, SyncProgressCallback
+
+# Snapshot de uma árvore: caminho relativo (com "/") -> informações do arquivo
+TreeSnapshot = Dict[str, RemoteFileInfo]
+
+# Recebe caminhos relativos e devolve {caminho_relativo: digest}
+TreeHasher = Callable[[List[str]], Dict[str, str]]
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+# --------------------------------------------------
+# PLANO
+# --------------------------------------------------
+
+@dataclass
+class SyncAction:
+    """Uma transferência planejada. `reason`: missing, size, content ou conflict."""
+    path: str
+    size_bytes: int
+    reason: str
+
+
+@dataclass
+class SyncConflict:
+    """Arquivo alterado nos dois lados que a política não resolveu."""
+    path: str
+    local: RemoteFileInfo
+    remote: RemoteFileInfo
+
+
+@dataclass
+class SyncPlan:
+    """
+    Plano tipado produzido pelo `SyncPlanner`.
+
+    Attributes:
+        downloads (list[SyncAction]): Remoto -> local.
+        uploads (list[SyncAction]): Local -> remoto.
+        conflicts (list[SyncConflict]): Conflitos não resolvidos (política SKIP).
+        delete_local (list[str]): Arquivos locais ausentes no remoto (espelhamento PULL).
+        delete_remote (list[str]): Arquivos remotos ausentes localmente (espelhamento PUSH).
+        hashed (int): Quantidade de arquivos que precisaram de hash de conteúdo.
+        estimated_seconds (float): Tempo estimado para executar o plano.
+    """
+    mode: SyncMode
+    downloads: List[SyncAction] = field(default_factory=list)
+    uploads: List[SyncAction] = field(default_factory=list)
+    conflicts: List[SyncConflict] = field(default_factory=list)
+    delete_local: List[str] = field(default_factory=list)
+    delete_remote: List[str] = field(default_factory=list)
+    hashed: int = 0
+    estimated_seconds: float = 0.0
+
+    @property
+    def download_bytes(self) -> int:
+        return sum(action.size_bytes for action in self.downloads)
+
+    @property
+    def upload_bytes(self) -> int:
+        return sum(action.size_bytes for action in self.uploads)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.download_bytes + self.upload_bytes
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.downloads or self.uploads or self.delete_local or self.delete_remote)
+
+
+# --------------------------------------------------
+# PLANNER
+# --------------------------------------------------
+
+class SyncPlanner:
+    """
+    Compara dois snapshots de árvore e produz um `SyncPlan`.
+
+    Regras de comparação para arquivos presentes nos dois lados:
+
+    - tamanhos diferentes: alterado;
+    - mesmo tamanho e mtimes dentro de `mtime_tolerance`: igual;
+    - mesmo tamanho e mtime divergente ou desconhecido: ambíguo. Com
+      `compare_content=True` o conteúdo é comparado por hash (lado local em
+      um pool de processos); sem isso, é considerado igual, como o sync
+      sempre fez.
+
+    Parameters
+    ----------
+    mtime_tolerance : float
+        Diferença máxima (segundos) para considerar mtimes iguais. Cobre a
+        resolução de 2 s de alguns servidores SMB/FAT.
+    conflict_policy : ConflictPolicy
+        Resolução de alterados no modo BIDIRECTIONAL. O padrão REMOTE_WINS
+        equivale ao comportamento anterior (pull antes do push).
+    compare_content : bool
+        Habilita hash de conteúdo para entradas ambíguas.
+    hash_workers : int
+        Processos usados para hash local (0 = `os.cpu_count()`).
+    delete_missing : bool
+        Em PUSH/PULL, remove no destino arquivos que não existem na origem.
+    throughput_bytes_per_second, per_file_overhead_seconds : float
+        Parâmetros da estimativa de tempo em `SyncPlan.estimated_seconds`.
+    """
+
+    def __init__(
+        self,
+        mtime_tolerance: float = 2.0,
+        conflict_policy: ConflictPolicy = ConflictPolicy.REMOTE_WINS,
+        compare_content: bool = False,
+        hash_workers: int = 0,
+        delete_missing: bool = False,
+        throughput_bytes_per_second: float = 50 * 1024 * 1024,
+        per_file_overhead_seconds: float = 0.01,
+    ):
+        self.mtime_tolerance = mtime_tolerance
+        self.conflict_policy = conflict_policy
+        self.compare_content = compare_content
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self.delete_missing = delete_missing
+        self.throughput_bytes_per_second = throughput_bytes_per_second
+        self.per_file_overhead_seconds = per_file_overhead_seconds
+
+    def plan(
+        self,
+        local: TreeSnapshot,
+        remote: TreeSnapshot,
+        mode: SyncMode = SyncMode.BIDIRECTIONAL,
+        local_hasher: Optional[TreeHasher] = None,
+        remote_hasher: Optional[TreeHasher] = None,
+    ) -> SyncPlan:
+        plan = SyncPlan(mode=mode)
+        pull = mode in (SyncMode.PULL, SyncMode.BIDIRECTIONAL)
+        push = mode in (SyncMode.PUSH, SyncMode.BIDIRECTIONAL)
+
+        changed: List[str] = []
+        ambiguous: List[str] = []
+
+        for path, r_info in remote.items():
+            l_info = local.get(path)
+            if l_info is None:
+                if pull:
+                    plan.downloads.append(SyncAction(path, r_info.size_bytes, "missing"))
+                elif self.delete_missing:
+                    plan.delete_remote.append(path)
+            elif l_info.size_bytes != r_info.size_bytes:
+                changed.append(path)
+            elif not self._same_mtime(l_info, r_info):
+                ambiguous.append(path)
+
+        for path, l_info in local.items():
+            if path in remote:
+                continue
+            if push:
+                plan.uploads.append(SyncAction(path, l_info.size_bytes, "missing"))
+            elif self.delete_missing:
+                plan.delete_local.append(path)
+
+        reasons = {path: "size" for path in changed}
+
+        if ambiguous and self.compare_content and local_hasher and remote_hasher:
+            local_digests = local_hasher(ambiguous)
+            remote_digests = remote_hasher(ambiguous)
+            plan.hashed = len(ambiguous)
+            for path in ambiguous:
+                if local_digests.get(path) != remote_digests.get(path):
+                    reasons[path] = "content"
+
+        for path, reason in reasons.items():
+            self._resolve(plan, path, local[path], remote[path], reason)
+
+        plan.estimated_seconds = self.estimate_seconds(plan)
+        return plan
+
+    def estimate_seconds(self, plan: SyncPlan) -> float:
+        files = len(plan.downloads) + len(plan.uploads) + len(plan.delete_local) + len(plan.delete_remote)
+        return plan.total_bytes / self.throughput_bytes_per_second + files * self.per_file_overhead_seconds
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _same_mtime(self, local: RemoteFileInfo, remote: RemoteFileInfo) -> bool:
+        if local.modified_time is None or remote.modified_time is None:
+            # Sem mtime não há como desempatar: só o hash pode decidir
+            return not self.compare_content
+        return abs(local.modified_time - remote.modified_time) <= self.mtime_tolerance
+
+    def _resolve(self, plan: SyncPlan, path: str, local: RemoteFileInfo, remote: RemoteFileInfo, reason: str):
+        download = SyncAction(path, remote.size_bytes, reason)
+        upload = SyncAction(path, local.size_bytes, reason)
+
+        if plan.mode is SyncMode.PULL:
+            plan.downloads.append(download)
+            return
+        if plan.mode is SyncMode.PUSH:
+            plan.uploads.append(upload)
+            return
+
+        policy = self.conflict_policy
+        if policy is ConflictPolicy.NEWER_WINS:
+            if local.modified_time is None or remote.modified_time is None:
+                policy = ConflictPolicy.SKIP
+            elif local.modified_time > remote.modified_time:
+                policy = ConflictPolicy.LOCAL_WINS
+            else:
+                policy = ConflictPolicy.REMOTE_WINS
+
+        if policy is ConflictPolicy.REMOTE_WINS:
+            download.reason = f"conflict:{reason}"
+            plan.downloads.append(download)
+        elif policy is ConflictPolicy.LOCAL_WINS:
+            upload.reason = f"conflict:{reason}"
+            plan.uploads.append(upload)
+        else:
+            plan.conflicts.append(SyncConflict(path, local, remote))
+
+
+# --------------------------------------------------
+# SNAPSHOTS & HASH
+# --------------------------------------------------
+
+def scan_local_tree(base: str) -> TreeSnapshot:
+    """Snapshot de uma árvore local, com caminhos relativos usando "/"."""
+    snapshot: TreeSnapshot = {}
+
+    for root, _, files in os.walk(base):
+        for name in files:
+            full = os.path.join(root, name)
+            rel = os.path.relpath(full, base).replace("\\", "/")
+            try:
+                stat = os.stat(full)
+            except OSError:
+                continue
+            snapshot[rel] = RemoteFileInfo(path=rel, size_bytes=stat.st_size, modified_time=stat.st_mtime)
+
+    return snapshot
+
+
+def hash_chunks(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.blake2b(digest_size=32)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hash_chunks(iter(lambda: f.read(HASH_BLOCK_SIZE), b""))
+
+
+def local_tree_hasher(base: str, workers: int) -> TreeHasher:
+    """Hasher para árvores acessíveis pelo FS local (disco, mount NFS) em um pool de processos."""
+    def hasher(paths: List[str]) -> Dict[str, str]:
+        full_paths = [os.path.join(base, p.replace("/", os.sep)) for p in paths]
+        if len(paths) == 1 or workers <= 1:
+            return {p: _hash_file(f) for p, f in zip(paths, full_paths)}
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            return dict(zip(paths, pool.map(_hash_file, full_paths, chunksize=8)))
+    return hasher
+
+
+def stream_hasher(read_chunks: Callable[[str], Iterator[bytes]], workers: int) -> TreeHasher:
+    """Hasher para backends remotos: lê via `read_chunks(caminho_relativo)` em threads."""
+    def hasher(paths: List[str]) -> Dict[str, str]:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as pool:
+            return dict(zip(paths, pool.map(lambda p: hash_chunks(read_chunks(p)), paths)))
+    return hasher
+
+
+# --------------------------------------------------
+# EXECUÇÃO
+# --------------------------------------------------
+
+def apply_sync_plan(
+    plan: SyncPlan,
+    download: Callable[[str, Optional[ProgressCallback]], None],
+    upload: Callable[[str, Optional[ProgressCallback]], None],
+    delete_local: Callable[[str], None],
+    delete_remote: Callable[[str], None],
+    progress: Optional[SyncProgressCallback] = None,
+    dry_run: bool = False,
+) -> SyncPlan:
+    """
+    Executa um plano com as operações do backend. Com `dry_run`, apenas
+    emite os eventos iniciais de progresso, como o sync sempre fez.
+    """
+    def report(kind: str, path: str) -> Optional[ProgressCallback]:
+        if not progress:
+            return None
+        return lambda processed, total: progress(f"{kind}:{path}", processed, total)
+
+    for action in plan.downloads:
+        if progress:
+            progress(f"download:{action.path}", 0, action.size_bytes)
+        if not dry_run:
+            download(action.path, report("download", action.path))
+
+    for action in plan.uploads:
+        if progress:
+            progress(f"upload:{action.path}", 0, action.size_bytes)
+        if not dry_run:
+            upload(action.path, report("upload", action.path))
+
+    if not dry_run:
+        for path in plan.delete_local:
+            delete_local(path)
+        for path in plan.delete_remote:
+            delete_remote(path)
+
+    return plan
@@ -1,3 +1,4 @@
+import errno
 import os
 import shutil
 from typing import Iterator, Optional, Dict, List
@@ -5,6 +6,7 @@ from typing import Iterator, Optional, Dict, List
 # Importe apenas o RemoteFileInfo, esqueça o FileInfo
 from ...interface import FileSystemInterface
 from ...types import ProgressCallback, SyncMode, SyncProgressCallback, RemoteFileInfo
+from ...sync_planner import SyncPlan, SyncPlanner, apply_sync_plan, local_tree_hasher, scan_local_tree
 
 
 class NFSClient(FileSystemInterface):
@@ -38,6 +40,28 @@ class NFSClient(FileSystemInterface):
     def _full(self, path: str) -> str:
         return os.path.join(self.mount_point, path.lstrip("/"))
 
+    @staticmethod
+    def _copy_file(src: str, dst: str):
+        """
+        Copia usando `copy_file_range`, que no NFS 4.2 vira um COPY executado
+        pelo servidor. Se o kernel/FS não suportar, cai no `shutil.copyfile`.
+        """
+        if hasattr(os, "copy_file_range"):
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                try:
+                    while remaining > 0:
+                        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(remaining, 1 << 30))
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                    return
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                        raise
+
+        shutil.copyfile(src, dst)
+
     # --------------------------------------------------
     # BASIC OPS
     # --------------------------------------------------
@@ -62,6 +86,48 @@ class NFSClient(FileSystemInterface):
             raise RuntimeError("Not connected")
         return os.listdir(self._full(path))
 
+    # --------------------------------------------------
+    # SERVER-SIDE COPY / MOVE
+    # --------------------------------------------------
+
+    def copy(self, src: str, dst: str):
+        if not self.connected:
+            raise RuntimeError("Not connected")
+
+        full_src = self._full(src)
+        full_dst = self._full(dst)
+
+        if os.path.isdir(full_src):
+            shutil.copytree(full_src, full_dst, copy_function=self._copy_file, dirs_exist_ok=True)
+            return
+
+        os.makedirs(os.path.dirname(full_dst), exist_ok=True)
+        self._copy_file(full_src, full_dst)
+
+    def move(self, src: str, dst: str):
+        if not self.connected:
+            raise RuntimeError("Not connected")
+
+        full_src = self._full(src)
+        full_dst = self._full(dst)
+        os.makedirs(os.path.dirname(full_dst), exist_ok=True)
+        # rename é atômico e não move dados dentro do mesmo export
+        try:
+            os.replace(full_src, full_dst)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        # Entre montagens/filesystems: copia (copy_file_range) e remove a origem
+        if os.path.isdir(full_src):
+            shutil.copytree(full_src, full_dst, copy_function=self._copy_file, dirs_exist_ok=True)
+            shutil.rmtree(full_src)
+        else:
+            self._copy_file(full_src, full_dst)
+            shutil.copystat(full_src, full_dst)
+            os.unlink(full_src)
+
     # --------------------------------------------------
     # TRANSFER
     # --------------------------------------------------
@@ -89,6 +155,28 @@ class NFSClient(FileSystemInterface):
                 if progress_callback:
                     progress_callback(processed, total)
 
+    def upload_bytes(
+            self,
+            data: bytes,
+            remote_path: str,
+            chunk_size: int = 1024 * 1024,
+            progress_callback: Optional[ProgressCallback] = None
+    ):
+        if not self.connected:
+            raise RuntimeError("Not connected")
+
+        dst = self._full(remote_path)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+
+        view = memoryview(data)
+        total = len(view)
+
+        with open(dst, "wb") as dstf:
+            for offset in range(0, total, chunk_size):
+                dstf.write(view[offset:offset + chunk_size])
+                if progress_callback:
+                    progress_callback(min(offset + chunk_size, total), total)
+
     def download(
             self,
             remote_path: str,
@@ -155,9 +243,9 @@ class NFSClient(FileSystemInterface):
                 rel = os.path.relpath(full, base).replace("\\", "/")
 
                 try:
-                    size = os.path.getsize(full)
+                    stat = os.stat(full)
                     # Usa RemoteFileInfo diretamente
-                    files.append(RemoteFileInfo(path=rel, size_bytes=size))
+                    files.append(RemoteFileInfo(path=rel, size_bytes=stat.st_size, modified_time=stat.st_mtime))
                 except OSError:
                     pass
 
@@ -174,27 +262,21 @@ class NFSClient(FileSystemInterface):
             mode: SyncMode = SyncMode.BIDIRECTIONAL,
             chunk_size: int = 1024 * 1024,
             progress: Optional[SyncProgressCallback] = None,
-            dry_run: bool = False
-    ):
+            dry_run: bool = False,
+            planner: Optional[SyncPlanner] = None
+    ) -> SyncPlan:
         if not self.connected:
             raise RuntimeError("Not connected")
 
+        planner = planner or SyncPlanner()
         local_base = os.path.abspath(local_base)
         os.makedirs(local_base, exist_ok=True)
 
-        # 1. Mapeamento Local SIMPLIFICADO
-        # Como removemos FileInfo, usamos um Dict simples: { "path": tamanho_int }
-        local_files_map: Dict[str, int] = {}
-
-        for root, _, files in os.walk(local_base):
-            for f in files:
-                full = os.path.join(root, f)
-                rel = os.path.relpath(full, local_base).replace("\\", "/")
-                local_files_map[rel] = os.path.getsize(full)
-
-        # 2. Mapeamento Remoto (Usa RemoteFileInfo)
-        remote_list = self.list_files_recursive(remote_base)
-        remote_files_map: Dict[str, RemoteFileInfo] = {f.path: f for f in remote_list}
+        # 1. Snapshots local e remoto (ambos com mtime)
+        local_files_map = scan_local_tree(local_base)
+        remote_files_map: Dict[str, RemoteFileInfo] = {
+            f.path: f for f in self.list_files_recursive(remote_base)
+        }
 
         def lp(p: str) -> str:
             return os.path.join(local_base, p)
@@ -202,38 +284,23 @@ class NFSClient(FileSystemInterface):
         def rp(p: str) -> str:
             return os.path.join(remote_base, p).replace("\\", "/")
 
-        # --- PULL (Remoto -> Local) ---
-        if mode in (SyncMode.PULL, SyncMode.BIDIRECTIONAL):
-            for path, r_info in remote_files_map.items():
-                local_size = local_files_map.get(path)
-
-                # Compara: Se não existe localmente (None) OU tamanho diferente
-                if local_size is None or local_size != r_info.size_bytes:
-                    if progress:
-                        progress(f"download:{path}", 0, r_info.size_bytes)
-                    if not dry_run:
-                        self.download(
-                            rp(path),
-                            lp(path),
-                            chunk_size,
-                            lambda p, t, e=path:
-                            progress(f"download:{e}", p, t) if progress else None
-                        )
-
-        # --- PUSH (Local -> Remoto) ---
-        if mode in (SyncMode.PUSH, SyncMode.BIDIRECTIONAL):
-            for path, l_size in local_files_map.items():
-                r_info = remote_files_map.get(path)
-
-                # Compara: Se não existe remotamente (None) OU tamanho diferente
-                if r_info is None or r_info.size_bytes != l_size:
-                    if progress:
-                        progress(f"upload:{path}", 0, l_size)
-                    if not dry_run:
-                        self.upload(
-                            lp(path),
-                            rp(path),
-                            chunk_size,
-                            lambda p, t, e=path:
-                            progress(f"upload:{e}", p, t) if progress else None
-                        )
\ No newline at end of file
+        # 2. Plano: o mount é acessível localmente, então os dois lados
+        # podem ser hasheados no pool de processos
+        plan = planner.plan(
+            local_files_map,
+            remote_files_map,
+            mode,
+            local_hasher=local_tree_hasher(local_base, planner.hash_workers),
+            remote_hasher=local_tree_hasher(self._full(remote_base), planner.hash_workers),
+        )
+
+        # 3. Execução
+        return apply_sync_plan(
+            plan,
+            download=lambda path, cb: self.download(rp(path), lp(path), chunk_size, cb),
+            upload=lambda path, cb: self.upload(lp(path), rp(path), chunk_size, cb),
+            delete_local=lambda path: os.remove(lp(path)),
+            delete_remote=lambda path: self.delete(rp(path)),
+            progress=progress,
+            dry_run=dry_run,
+        )
@@ -0,0 +1 @@
+from .s3 import S3Client
\ No newline at end of file
@@ -0,0 +1,522 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from ...interface import FileSystemInterface
+from ...types import ProgressCallback, SyncMode, SyncProgressCallback, RemoteFileInfo
+from ...sync_planner import SyncPlan, SyncPlanner, apply_sync_plan, local_tree_hasher, scan_local_tree, stream_hasher
+
+MIN_PART_SIZE = 5 * 1024 * 1024             # mínimo exigido pelo S3 (exceto última parte)
+MAX_PARTS = 10_000                          # máximo de partes por multipart upload
+MAX_SINGLE_COPY_SIZE = 5 * 1024 ** 3        # copy_object aceita até 5 GB
+DELETE_BATCH_SIZE = 1000                    # limite do delete_objects
+
+
+class S3Client(FileSystemInterface):
+    """
+    Backend para armazenamento de objetos compatível com S3 (AWS, MinIO, Ceph...).
+
+    - Upload multipart com partes enviadas em paralelo.
+    - Download com GETs por faixa (Range) em paralelo.
+    - Listagem paginada exposta como gerador (`iter_files_recursive`).
+    - Cópia server-side (`copy_object` / `upload_part_copy`), sem trafegar
+      dados pelo client.
+
+    Para testes locais, basta um MinIO:
+
+        docker run -d -p 9000:9000 -e MINIO_ROOT_USER=minio \\
+            -e MINIO_ROOT_PASSWORD=minio123 minio/minio server /data
+
+    >>> S3Client(bucket="datasets", endpoint_url="http://127.0.0.1:9000",
+    ...          access_key="minio", secret_key="minio123")
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+        prefix: str = "",
+        max_workers: int = 8,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.prefix = prefix.replace("\\", "/").strip("/")
+        self.max_workers = max_workers
+        self.multipart_threshold = multipart_threshold
+        self.part_size = max(part_size, MIN_PART_SIZE)
+
+        self.client: Any = None
+        self.executor: ThreadPoolExecutor | None = None
+
+    # --------------------------------------------------
+    # CONNECTION
+    # --------------------------------------------------
+
+    def connect(self):
+        config = Config(
+            max_pool_connections=self.max_workers * 2,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+            # MinIO e similares não suportam virtual-hosted style
+            s3={"addressing_style": "path" if self.endpoint_url else "auto"},
+        )
+        self.client = boto3.session.Session().client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
+            region_name=self.region,
+            config=config,
+        )
+        self.client.head_bucket(Bucket=self.bucket)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="S3Transfer")
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.client:
+            self.client.close()
+            self.client = None
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _ensure_connected(self):
+        if not self.client or not self.executor:
+            raise RuntimeError("Not connected")
+
+    def _key(self, path: str) -> str:
+        clean = path.replace("\\", "/").strip("/")
+        return "/".join(part for part in (self.prefix, clean) if part)
+
+    def _dir_prefix(self, path: str) -> str:
+        key = self._key(path)
+        return f"{key}/" if key else ""
+
+    def _part_size_for(self, size: int, chunk_size: int) -> int:
+        part_size = max(chunk_size, self.part_size)
+        # Garante que o arquivo caiba em MAX_PARTS partes
+        while part_size * MAX_PARTS < size:
+            part_size *= 2
+        return part_size
+
+    @staticmethod
+    def _ranges(size: int, part_size: int) -> List[Tuple[int, int]]:
+        """Retorna faixas `(início, fim_inclusivo)` cobrindo `size` bytes."""
+        return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+    def _iter_keys(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            yield from page.get("Contents", [])
+
+    def _get_range(self, key: str, start: int, end: int) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}")
+        return response["Body"].read()
+
+    # --------------------------------------------------
+    # BASIC OPS
+    # --------------------------------------------------
+
+    def mkdir(self, path: str):
+        """S3 não possui diretórios: cria um objeto marcador `path/`."""
+        self._ensure_connected()
+        self.client.put_object(Bucket=self.bucket, Key=self._dir_prefix(path), Body=b"")
+
+    def delete(self, path: str):
+        """
+        Remove o objeto `path` ou, se ele não existir como objeto, todos os
+        objetos sob o "diretório" `path`. A raiz (`""`) é recusada.
+        """
+        self._ensure_connected()
+
+        if not path.replace("\\", "/").strip("/"):
+            raise ValueError("Refusing to delete the root of the bucket/prefix")
+
+        key = self._key(path)
+
+        # Arquivo: remove só a chave exata, sem listar o prefixo
+        if not path.endswith(("/", "\\")):
+            try:
+                self.client.head_object(Bucket=self.bucket, Key=key)
+            except ClientError as error:
+                if error.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+            else:
+                self.client.delete_object(Bucket=self.bucket, Key=key)
+                return
+
+        batch: List[Dict[str, str]] = []
+        for obj in self._iter_keys(self._dir_prefix(path)):
+            batch.append({"Key": obj["Key"]})
+            if len(batch) == DELETE_BATCH_SIZE:
+                self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True})
+                batch = []
+        if batch:
+            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True})
+
+    def listdir(self, path: str = "") -> list[str]:
+        self._ensure_connected()
+
+        prefix = self._dir_prefix(path)
+        result: List[str] = []
+        paginator = self.client.get_paginator("list_objects_v2")
+
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter="/"):
+            for common in page.get("CommonPrefixes", []):
+                result.append(common["Prefix"][len(prefix):].rstrip("/"))
+            for obj in page.get("Contents", []):
+                name = obj["Key"][len(prefix):]
+                if name:
+                    result.append(name)
+        return result
+
+    # --------------------------------------------------
+    # TRANSFER
+    # --------------------------------------------------
+
+    def upload(
+        self,
+        local_path: str,
+        remote_path: str,
+        chunk_size: int = 1024 * 1024,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        self._ensure_connected()
+
+        key = self._key(remote_path)
+        total = os.path.getsize(local_path)
+
+        if total <= self.multipart_threshold:
+            with open(local_path, "rb") as f:
+                self.client.put_object(Bucket=self.bucket, Key=key, Body=f.read())
+            if progress_callback:
+                progress_callback(total, total)
+            return
+
+        def read_range(start: int, end: int) -> bytes:
+            with open(local_path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start + 1)
+
+        self._multipart_upload(key, total, chunk_size, progress_callback, read_range)
+
+    def upload_bytes(
+        self,
+        data: bytes,
+        remote_path: str,
+        chunk_size: int = 1024 * 1024,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        """Envia o buffer direto da memória (um PUT; multipart acima do limiar)."""
+        self._ensure_connected()
+
+        key = self._key(remote_path)
+        total = len(data)
+
+        if total <= self.multipart_threshold:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=bytes(data))
+            if progress_callback:
+                progress_callback(total, total)
+            return
+
+        view = memoryview(data)
+        self._multipart_upload(
+            key, total, chunk_size, progress_callback, lambda start, end: bytes(view[start:end + 1])
+        )
+
+    def _multipart_upload(
+        self,
+        key: str,
+        total: int,
+        chunk_size: int,
+        progress_callback: Optional[ProgressCallback],
+        read_range: Callable[[int, int], bytes],
+    ):
+        """Multipart com partes em paralelo; `read_range(início, fim)` fornece cada parte."""
+        part_size = self._part_size_for(total, chunk_size)
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+
+        lock = Lock()
+        processed = 0
+
+        def send_part(number: int, start: int, end: int) -> Dict[str, Any]:
+            nonlocal processed
+            body = read_range(start, end)
+            response = self.client.upload_part(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body
+            )
+            if progress_callback:
+                with lock:
+                    processed += len(body)
+                    progress_callback(processed, total)
+            return {"PartNumber": number, "ETag": response["ETag"]}
+
+        try:
+            futures = [
+                self.executor.submit(send_part, number, start, end)
+                for number, (start, end) in enumerate(self._ranges(total, part_size), start=1)
+            ]
+            parts = [future.result() for future in futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def download(
+        self,
+        remote_path: str,
+        local_path: str,
+        chunk_size: int = 1024 * 1024,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        self._ensure_connected()
+
+        key = self._key(remote_path)
+        total = self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+        local_dir = os.path.dirname(local_path)
+        if local_dir:
+            os.makedirs(local_dir, exist_ok=True)
+
+        if total <= self.multipart_threshold:
+            processed = 0
+            body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+            with open(local_path, "wb") as f:
+                for chunk in body.iter_chunks(chunk_size):
+                    f.write(chunk)
+                    processed += len(chunk)
+                    if progress_callback:
+                        progress_callback(processed, total)
+            return
+
+        # Pré-aloca o arquivo para que cada faixa seja escrita no seu offset
+        with open(local_path, "wb") as f:
+            f.truncate(total)
+
+        lock = Lock()
+        processed = 0
+
+        def fetch(start: int, end: int):
+            nonlocal processed
+            data = self._get_range(key, start, end)
+            with open(local_path, "r+b") as f:
+                f.seek(start)
+                f.write(data)
+            if progress_callback:
+                with lock:
+                    processed += len(data)
+                    progress_callback(processed, total)
+
+        part_size = self._part_size_for(total, chunk_size)
+        futures = [self.executor.submit(fetch, start, end) for start, end in self._ranges(total, part_size)]
+        for future in futures:
+            future.result()
+
+    def read_file_chunks(
+        self,
+        remote_path: str,
+        chunk_size: int = 1024 * 1024,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Iterator[bytes]:
+        """
+        Lê o objeto em chunks ordenados, mantendo até `max_workers` GETs por
+        faixa em voo (read-ahead). A memória fica limitada a
+        `max_workers * chunk_size`.
+        """
+        self._ensure_connected()
+
+        key = self._key(remote_path)
+        total = self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        ranges = deque(self._ranges(total, chunk_size))
+        in_flight: Deque[Future[bytes]] = deque()
+        processed = 0
+
+        try:
+            while ranges or in_flight:
+                while ranges and len(in_flight) < self.max_workers:
+                    start, end = ranges.popleft()
+                    in_flight.append(self.executor.submit(self._get_range, key, start, end))
+
+                data = in_flight.popleft().result()
+                processed += len(data)
+                if progress_callback:
+                    progress_callback(processed, total)
+                yield data
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    # --------------------------------------------------
+    # SERVER-SIDE COPY
+    # --------------------------------------------------
+
+    def _copy_object(self, src_key: str, dst_key: str, size: int):
+        source = {"Bucket": self.bucket, "Key": src_key}
+
+        if size <= MAX_SINGLE_COPY_SIZE:
+            self.client.copy_object(Bucket=self.bucket, Key=dst_key, CopySource=source)
+            return
+
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=dst_key)["UploadId"]
+
+        def copy_part(number: int, start: int, end: int) -> Dict[str, Any]:
+            response = self.client.upload_part_copy(
+                Bucket=self.bucket, Key=dst_key, UploadId=upload_id, PartNumber=number,
+                CopySource=source, CopySourceRange=f"bytes={start}-{end}",
+            )
+            return {"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]}
+
+        try:
+            part_size = self._part_size_for(size, MAX_SINGLE_COPY_SIZE // 8)
+            futures = [
+                self.executor.submit(copy_part, number, start, end)
+                for number, (start, end) in enumerate(self._ranges(size, part_size), start=1)
+            ]
+            parts = [future.result() for future in futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=dst_key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=dst_key, UploadId=upload_id)
+            raise
+
+    def _copy_jobs(self, src: str, dst: str) -> List[Tuple[str, str, int]]:
+        """
+        Expande `src` em jobs `(src_key, dst_key, tamanho)`. Se `src` não for um
+        objeto, é tratado como "diretório" e todos os objetos sob ele são copiados.
+        """
+        src_key = self._key(src)
+        dst_key = self._key(dst)
+
+        try:
+            size = self.client.head_object(Bucket=self.bucket, Key=src_key)["ContentLength"]
+            return [(src_key, dst_key, size)]
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                raise
+
+        src_prefix = self._dir_prefix(src)
+        dst_prefix = self._dir_prefix(dst)
+        return [
+            (obj["Key"], dst_prefix + obj["Key"][len(src_prefix):], obj["Size"])
+            for obj in self._iter_keys(src_prefix)
+        ]
+
+    def _run_copy_jobs(self, jobs: List[Tuple[str, str, int]]):
+        # Pool próprio: `_copy_object` pode usar `self.executor` para as partes,
+        # e aninhar no mesmo pool poderia esgotá-lo.
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="S3Copy") as pool:
+            for future in [pool.submit(self._copy_object, *job) for job in jobs]:
+                future.result()
+
+    def copy(self, src: str, dst: str):
+        """Copia `src` para `dst` dentro do bucket, sem trafegar dados pelo client."""
+        self._ensure_connected()
+        self._run_copy_jobs(self._copy_jobs(src, dst))
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]]):
+        """Copia todos os pares em paralelo, sempre server-side."""
+        self._ensure_connected()
+        self._run_copy_jobs([job for src, dst in pairs for job in self._copy_jobs(src, dst)])
+
+    def move(self, src: str, dst: str):
+        """S3 não possui rename: copia server-side e remove a origem."""
+        self.copy(src, dst)
+        self.delete(src)
+
+    def move_many(self, pairs: Iterable[Tuple[str, str]]):
+        pairs = list(pairs)
+        self.copy_many(pairs)
+        for src, _ in pairs:
+            self.delete(src)
+
+    # --------------------------------------------------
+    # RECURSIVE LIST
+    # --------------------------------------------------
+
+    def iter_files_recursive(self, base_path: str) -> Iterator[RemoteFileInfo]:
+        """
+        Percorre a listagem paginada sob `base_path`, produzindo um
+        RemoteFileInfo por objeto sem materializar a listagem inteira.
+        """
+        self._ensure_connected()
+
+        prefix = self._dir_prefix(base_path)
+        for obj in self._iter_keys(prefix):
+            rel = obj["Key"][len(prefix):]
+            # Ignora marcadores de diretório criados por mkdir
+            if rel and not rel.endswith("/"):
+                yield RemoteFileInfo(path=rel, size_bytes=obj["Size"], modified_time=obj["LastModified"].timestamp())
+
+    def list_files_recursive(self, base_path: str) -> List[RemoteFileInfo]:
+        return list(self.iter_files_recursive(base_path))
+
+    # --------------------------------------------------
+    # SYNC
+    # --------------------------------------------------
+
+    def sync(
+        self,
+        local_base: str,
+        remote_base: str,
+        mode: SyncMode = SyncMode.BIDIRECTIONAL,
+        chunk_size: int = 1024 * 1024,
+        progress: Optional[SyncProgressCallback] = None,
+        dry_run: bool = False,
+        planner: Optional[SyncPlanner] = None
+    ) -> SyncPlan:
+        self._ensure_connected()
+
+        planner = planner or SyncPlanner()
+        local_base = os.path.abspath(local_base)
+        os.makedirs(local_base, exist_ok=True)
+
+        # 1. Snapshots local e remoto (listagem paginada)
+        local_files_map = scan_local_tree(local_base)
+        remote_files_map: Dict[str, RemoteFileInfo] = {f.path: f for f in self.iter_files_recursive(remote_base)}
+
+        def lp(p: str) -> str:
+            return os.path.join(local_base, p.replace("/", os.sep))
+
+        def rp(p: str) -> str:
+            return f"{remote_base.strip('/')}/{p}" if remote_base.strip("/") else p
+
+        # 2. Plano: o client boto3 é thread-safe, então o hash remoto é paralelo
+        plan = planner.plan(
+            local_files_map,
+            remote_files_map,
+            mode,
+            local_hasher=local_tree_hasher(local_base, planner.hash_workers),
+            remote_hasher=stream_hasher(
+                lambda p: self.read_file_chunks(rp(p), chunk_size, None), self.max_workers
+            ),
+        )
+
+        # 3. Execução
+        return apply_sync_plan(
+            plan,
+            download=lambda path, cb: self.download(rp(path), lp(path), chunk_size, cb),
+            upload=lambda path, cb: self.upload(lp(path), rp(path), chunk_size, cb),
+            delete_local=lambda path: os.remove(lp(path)),
+            delete_remote=lambda path: self.delete(rp(path)),
+            progress=progress,
+            dry_run=dry_run,
+        )
@@ -1,3 +1,4 @@
+from datetime import UTC
 from typing import Iterator, Optional, Dict, List
 from uuid import uuid4
 import os
@@ -7,6 +8,8 @@ from smbprotocol.session import Session
 from smbprotocol.tree import TreeConnect
 from smbprotocol.open import (
     Open,
+    SMB2SetInfoRequest,
+    SMB2SetInfoResponse,
     CreateDisposition,
     CreateOptions,
     ImpersonationLevel,
@@ -14,11 +17,22 @@ from smbprotocol.open import (
     FilePipePrinterAccessMask,
     ShareAccess
 )
-from smbprotocol.file_info import FileInformationClass
+from smbprotocol.file_info import FileInformationClass, FileRenameInformation
+from smbprotocol.ioctl import (
+    CtlCode,
+    IOCTLFlags,
+    SMB2IOCTLRequest,
+    SMB2IOCTLResponse,
+    SMB2SrvCopyChunk,
+    SMB2SrvCopyChunkCopy,
+    SMB2SrvCopyChunkResponse,
+    SMB2SrvRequestResumeKey,
+)
 
 # Importe apenas o RemoteFileInfo, esqueça o FileInfo
 from seisbai_tools.file_system.interface import FileSystemInterface
 from ...types import ProgressCallback, SyncMode, SyncProgressCallback, RemoteFileInfo
+from ...sync_planner import SyncPlan, SyncPlanner, apply_sync_plan, local_tree_hasher, scan_local_tree, stream_hasher
 
 DEFAULT_IMPERSONATION = ImpersonationLevel.Impersonation
 DEFAULT_DESIRED_ACCESS = (
@@ -37,6 +51,10 @@ DIR_ATTRS = FileAttributes.FILE_ATTRIBUTE_DIRECTORY
 DIR_CREATE_OPTS = CreateOptions.FILE_DIRECTORY_FILE
 FILE_CREATE_OPTS = CreateOptions.FILE_NON_DIRECTORY_FILE
 
+# Limites usuais do FSCTL_SRV_COPYCHUNK (MS-SMB2 3.3.3)
+MAX_COPY_CHUNK_SIZE = 1024 * 1024
+MAX_COPY_CHUNK_COUNT = 16
+
 
 class SMBClient(FileSystemInterface):
 
@@ -97,14 +115,14 @@ class SMBClient(FileSystemInterface):
     # LOW LEVEL & HELPERS
     # --------------------------------------------------
 
-    def _open_file(self, path: str, disposition, options):
+    def _open_file(self, path: str, disposition, options, desired_access=DEFAULT_DESIRED_ACCESS):
         # Normalização crítica: SMB odeia '/'
         clean_path = path.replace("/", "\\").strip("\\")
 
         fh = Open(tree=self.tree, name=clean_path)
         fh.create(
             impersonation_level=DEFAULT_IMPERSONATION,
-            desired_access=DEFAULT_DESIRED_ACCESS,
+            desired_access=desired_access,
             file_attributes=DEFAULT_FILE_ATTRS,
             share_access=DEFAULT_SHARE_ACCESS,
             create_disposition=disposition,
@@ -124,6 +142,26 @@ class SMBClient(FileSystemInterface):
             except Exception:
                 pass
 
+    def _send(self, request, response_type):
+        """Envia uma requisição SMB2 crua na árvore atual e desempacota a resposta."""
+        sent = self.connection.send(
+            request,
+            sid=self.session.session_id,
+            tid=self.tree.tree_connect_id,
+        )
+        response = response_type()
+        response.unpack(self.connection.receive(sent)["data"].get_value())
+        return response
+
+    def _ioctl(self, fh: Open, ctl_code, output_size: int, input_buffer=b""):
+        request = SMB2IOCTLRequest()
+        request["ctl_code"] = ctl_code
+        request["file_id"] = fh.file_id
+        request["max_output_response"] = output_size
+        request["flags"] = IOCTLFlags.SMB2_0_IOCTL_IS_FSCTL
+        request["buffer"] = input_buffer
+        return self._send(request, SMB2IOCTLResponse)["buffer"].get_value()
+
     def _decode_name(self, name_bytes) -> str:
         """Helper para decodificar nomes retornados pelo SMB (UTF-16-LE)."""
         if isinstance(name_bytes, bytes):
@@ -178,6 +216,95 @@ class SMBClient(FileSystemInterface):
                 result.append(name)
         return result
 
+    # --------------------------------------------------
+    # SERVER-SIDE COPY / MOVE
+    # --------------------------------------------------
+
+    def _copy_file(self, src: str, dst: str):
+        """
+        Cópia server-side via FSCTL_SRV_COPYCHUNK_WRITE: o client apenas
+        descreve os chunks, os dados não trafegam pela rede.
+        """
+        self._ensure_remote_dirs(dst)
+
+        src_fh = self._open_file(src, CreateDisposition.FILE_OPEN, FILE_CREATE_OPTS, DIR_ACCESS_MASK)
+        try:
+            resume = SMB2SrvRequestResumeKey()
+            resume.unpack(self._ioctl(src_fh, CtlCode.FSCTL_SRV_REQUEST_RESUME_KEY, output_size=32))
+            resume_key = resume["resume_key"].get_value()
+            size = src_fh.end_of_file
+
+            chunks = []
+            for offset in range(0, size, MAX_COPY_CHUNK_SIZE):
+                chunk = SMB2SrvCopyChunk()
+                chunk["source_offset"] = offset
+                chunk["target_offset"] = offset
+                chunk["length"] = min(MAX_COPY_CHUNK_SIZE, size - offset)
+                chunks.append(chunk)
+
+            dst_fh = self._open_file(dst, CreateDisposition.FILE_OVERWRITE_IF, FILE_CREATE_OPTS)
+            try:
+                for i in range(0, len(chunks), MAX_COPY_CHUNK_COUNT):
+                    batch = chunks[i:i + MAX_COPY_CHUNK_COUNT]
+                    copy_request = SMB2SrvCopyChunkCopy()
+                    copy_request["source_key"] = resume_key
+                    copy_request["chunks"] = batch
+
+                    result = SMB2SrvCopyChunkResponse()
+                    result.unpack(self._ioctl(dst_fh, CtlCode.FSCTL_SRV_COPYCHUNK_WRITE, 12, copy_request))
+                    if result["chunks_written"].get_value() != len(batch):
+                        raise OSError(f"Cópia server-side incompleta: {src} -> {dst}")
+            finally:
+                dst_fh.close()
+        finally:
+            src_fh.close()
+
+    def copy(self, src: str, dst: str):
+        src_clean = src.replace("\\", "/").strip("/")
+        dst_clean = dst.replace("\\", "/").strip("/")
+
+        files = self._list_if_directory(src_clean)
+        if files is None:
+            self._copy_file(src_clean, dst_clean)
+            return
+
+        for info in files:
+            self._copy_file(f"{src_clean}/{info.path}", f"{dst_clean}/{info.path}")
+
+    def move(self, src: str, dst: str):
+        """Renomeia via SET_INFO(FileRenameInformation); funciona para arquivos e pastas."""
+        self._ensure_remote_dirs(dst)
+
+        fh = self._open_file(
+            src,
+            CreateDisposition.FILE_OPEN,
+            0,
+            FilePipePrinterAccessMask.DELETE | FilePipePrinterAccessMask.FILE_READ_ATTRIBUTES,
+        )
+        try:
+            rename = FileRenameInformation()
+            rename["replace_if_exists"] = True
+            rename["file_name"] = dst.replace("/", "\\").strip("\\")
+
+            request = SMB2SetInfoRequest()
+            request["info_type"] = rename.INFO_TYPE
+            request["file_info_class"] = rename.INFO_CLASS
+            request["file_id"] = fh.file_id
+            request["buffer"] = rename
+            self._send(request, SMB2SetInfoResponse)
+        finally:
+            fh.close()
+
+    def _list_if_directory(self, path: str) -> Optional[List[RemoteFileInfo]]:
+        """Retorna os arquivos sob `path` se for diretório, ou None se for arquivo."""
+        fh = self._open_file(path, CreateDisposition.FILE_OPEN, 0, DIR_ACCESS_MASK)
+        try:
+            is_dir = bool(fh.file_attributes & FileAttributes.FILE_ATTRIBUTE_DIRECTORY)
+        finally:
+            fh.close()
+
+        return self.list_files_recursive(path) if is_dir else None
+
     # --------------------------------------------------
     # TRANSFER
     # --------------------------------------------------
@@ -189,12 +316,21 @@ class SMBClient(FileSystemInterface):
         chunk_size: int = 1024 * 1024,
         progress_callback: Optional[ProgressCallback] = None
     ):
-        self._ensure_remote_dirs(remote_path)
-        remote_path = remote_path.replace("/", "\\")
-
         with open(local_path, "rb") as f:
             data = f.read()
 
+        self.upload_bytes(data, remote_path, chunk_size, progress_callback)
+
+    def upload_bytes(
+        self,
+        data: bytes,
+        remote_path: str,
+        chunk_size: int = 1024 * 1024,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        self._ensure_remote_dirs(remote_path)
+        remote_path = remote_path.replace("/", "\\")
+
         fh = self._open_file(
             remote_path,
             CreateDisposition.FILE_OVERWRITE_IF,
@@ -466,8 +602,13 @@ class SMBClient(FileSystemInterface):
                     # Padroniza para forward slash (/) para uso no dicionário
                     rel_key = rel_path.replace("\\", "/")
 
+                    # last_write_time vem como datetime UTC sem tzinfo
+                    modified = entry["last_write_time"].get_value()
+                    if modified.tzinfo is None:
+                        modified = modified.replace(tzinfo=UTC)
+
                     # Adiciona à lista usando RemoteFileInfo e size_bytes
-                    files.append(RemoteFileInfo(path=rel_key, size_bytes=size))
+                    files.append(RemoteFileInfo(path=rel_key, size_bytes=size, modified_time=modified.timestamp()))
 
         walk(base_path_clean)
         return files
@@ -483,22 +624,18 @@ class SMBClient(FileSystemInterface):
         mode: SyncMode = SyncMode.BIDIRECTIONAL,
         chunk_size: int = 1024 * 1024,
         progress: Optional[SyncProgressCallback] = None,
-        dry_run: bool = False
-    ):
+        dry_run: bool = False,
+        planner: Optional[SyncPlanner] = None
+    ) -> SyncPlan:
+        planner = planner or SyncPlanner()
         local_base = os.path.abspath(local_base)
         os.makedirs(local_base, exist_ok=True)
 
-        # 1. Mapeamento Local (SIMPLIFICADO: path -> int)
-        local_files_map: Dict[str, int] = {}
-        for root, _, files in os.walk(local_base):
-            for f in files:
-                full_local = os.path.join(root, f)
-                rel = os.path.relpath(full_local, local_base).replace("\\", "/")
-                local_files_map[rel] = os.path.getsize(full_local)
-
-        # 2. Mapeamento Remoto (Usa RemoteFileInfo)
-        remote_list = self.list_files_recursive(remote_base)
-        remote_files_map: Dict[str, RemoteFileInfo] = {f.path: f for f in remote_list}
+        # 1. Snapshots local e remoto (ambos com mtime)
+        local_files_map = scan_local_tree(local_base)
+        remote_files_map: Dict[str, RemoteFileInfo] = {
+            f.path: f for f in self.list_files_recursive(remote_base)
+        }
 
         # Helpers de Path
         def get_local_abs(rel_p: str) -> str:
@@ -511,36 +648,24 @@ class SMBClient(FileSystemInterface):
                 return f"{clean_remote}\\{clean_rel}"
             return clean_rel
 
-        #
-
-        # --- PULL (Remoto -> Local) ---
-        if mode in (SyncMode.PULL, SyncMode.BIDIRECTIONAL):
-            for path, r_info in remote_files_map.items():
-                local_size = local_files_map.get(path)
-
-                # Se não existe localmente (None) OU tamanho diferente
-                if local_size is None or local_size != r_info.size_bytes:
-                    if progress: progress(f"download:{path}", 0, r_info.size_bytes)
-                    if not dry_run:
-                        self.download(
-                            get_remote_abs(path),
-                            get_local_abs(path),
-                            chunk_size,
-                            lambda p, t, e=path: progress(f"download:{e}", p, t) if progress else None
-                        )
-
-        # --- PUSH (Local -> Remoto) ---
-        if mode in (SyncMode.PUSH, SyncMode.BIDIRECTIONAL):
-            for path, l_size in local_files_map.items():
-                r_info = remote_files_map.get(path)
-
-                # Se não existe remotamente (None) OU tamanho diferente
-                if r_info is None or r_info.size_bytes != l_size:
-                    if progress: progress(f"upload:{path}", 0, l_size)
-                    if not dry_run:
-                        self.upload(
-                            get_local_abs(path),
-                            get_remote_abs(path),
-                            chunk_size,
-                            lambda p, t, e=path: progress(f"upload:{e}", p, t) if progress else None
-                        )
\ No newline at end of file
+        # 2. Plano: hash remoto é feito lendo pela mesma conexão (1 worker)
+        plan = planner.plan(
+            local_files_map,
+            remote_files_map,
+            mode,
+            local_hasher=local_tree_hasher(local_base, planner.hash_workers),
+            remote_hasher=stream_hasher(
+                lambda p: self.read_file_chunks(get_remote_abs(p), chunk_size, None), 1
+            ),
+        )
+
+        # 3. Execução
+        return apply_sync_plan(
+            plan,
+            download=lambda path, cb: self.download(get_remote_abs(path), get_local_abs(path), chunk_size, cb),
+            upload=lambda path, cb: self.upload(get_local_abs(path), get_remote_abs(path), chunk_size, cb),
+            delete_local=lambda path: os.remove(get_local_abs(path)),
+            delete_remote=lambda path: self.delete(get_remote_abs(path)),
+            progress=progress,
+            dry_run=dry_run,
+        )
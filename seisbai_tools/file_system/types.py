@@ -11,7 +11,15 @@ class SyncMode(str, Enum):
     PULL = "pull"
     BIDIRECTIONAL = "bidirectional"
 
+class ConflictPolicy(str, Enum):
+    """Como resolver arquivos alterados dos dois lados no modo BIDIRECTIONAL."""
+    REMOTE_WINS = "remote_wins"
+    LOCAL_WINS = "local_wins"
+    NEWER_WINS = "newer_wins"
+    SKIP = "skip"
+
 from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass
@@ -27,9 +35,11 @@ class RemoteFileInfo:
         extension (str): Extensão (ex: .txt).
         directory (str): Caminho da pasta onde o arquivo está.
         size (str): Tamanho formatado (ex: 1.5 MB).
+        modified_time (float | None): Última modificação (epoch, UTC), se conhecida.
     """
     path: str
     size_bytes: int
+    modified_time: Optional[float] = None
 
     name: str = field(init=False)
     extension: str = field(init=False)
@@ -0,0 +1,349 @@
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Condition, Thread
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from .interface import FileSystemInterface
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class WriteBehindError(RuntimeError):
+    """
+    Levantada por `flush`/`close` quando uploads em background falharam.
+
+    Attributes
+    ----------
+    failures : list of (str, BaseException)
+        Caminho remoto e erro de cada upload que falhou.
+    """
+
+    def __init__(self, failures: List[Tuple[str, BaseException]]):
+        self.failures = failures
+        paths = ", ".join(path for path, _ in failures[:5])
+        more = f" (+{len(failures) - 5})" if len(failures) > 5 else ""
+        super().__init__(f"{len(failures)} upload(s) failed: {paths}{more}")
+
+
+@dataclass
+class _PendingUpload:
+    seq: int
+    remote_path: str
+    size: int
+    local_path: Optional[str] = None
+    data: Optional[bytes] = None
+    staged: bool = False         # arquivo em staging, removido após o upload
+    delete_after: bool = False   # arquivo do chamador, removido após o upload
+    replaces: List[int] = field(default_factory=list)  # seqs das versões substituídas
+
+
+class WriteBehindUploader:
+    """
+    Upload em background (write-behind) para amostras geradas.
+
+    O produtor (ex.: o gerador de cubos) entrega arquivos locais ou buffers em
+    memória e segue gerando; uploads acontecem em threads próprias. Antes de
+    emitir o evento de conclusão, o job chama `flush()` para aguardar que tudo
+    que foi submetido até ali esteja no destino.
+
+    - Memória limitada: buffers ficam em RAM até `max_memory_bytes`; acima
+      disso são despejados em `staging_dir` até `max_staging_bytes`. Quando
+      ambos estão cheios, `submit_bytes` bloqueia (back-pressure).
+    - Coalescência por caminho: reenviar o mesmo `remote_path` antes do upload
+      substitui a versão pendente (vale a última). Arquivos pequenos não são
+      agrupados nem empacotados: cada item é um upload próprio.
+    - Uploads de um mesmo `remote_path` nunca correm em paralelo: a versão
+      nova espera a que já está em envio terminar.
+    - Falhas são repetidas até `max_retries` vezes, com backoff exponencial
+      de `retry_delay` até `max_retry_delay` segundos.
+    - Buffers em memória vão direto do buffer (`upload_bytes` do backend),
+      sem passar por arquivo.
+    - `workers > 1` exige um backend seguro entre threads (NFS, S3).
+
+    Exemplo
+    -------
+    >>> with WriteBehindUploader(manager) as uploader:
+    ...     for i, sample in enumerate(samples):
+    ...         uploader.submit_bytes(sample.tobytes(), f"dataset/sample_{i}.npy")
+    ...     uploader.flush()  # durável: pode emitir o CompletedEvent
+    """
+
+    def __init__(
+        self,
+        client: FileSystemInterface,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        max_staging_bytes: int = 4 * 1024 ** 3,
+        staging_dir: Optional[str] = None,
+        workers: int = 1,
+        chunk_size: int = 1024 * 1024,
+        max_retries: int = 2,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 10.0,
+    ):
+        self.client = client
+        self.max_memory_bytes = max_memory_bytes
+        self.max_staging_bytes = max_staging_bytes
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self._owns_staging_dir = staging_dir is None
+        self._staging_dir = staging_dir or tempfile.mkdtemp(prefix="seisbai_write_behind_")
+        os.makedirs(self._staging_dir, exist_ok=True)
+
+        self._cond = Condition()
+        self._queue: Deque[_PendingUpload] = deque()
+        self._pending_by_path: Dict[str, _PendingUpload] = {}
+        self._uploading: Dict[str, _PendingUpload] = {}
+        self._outstanding: Dict[int, _PendingUpload] = {}
+        self._failures: List[Tuple[str, BaseException]] = []
+        self._next_seq = 0
+        self._memory_used = 0
+        self._staging_used = 0
+        self._closed = False
+
+        self._threads = [
+            Thread(target=self._worker, name=f"WriteBehindUploader-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # --------------------------------------------------
+    # API
+    # --------------------------------------------------
+
+    def submit_file(self, local_path: str, remote_path: str, delete_after: bool = False):
+        """
+        Agenda o upload de um arquivo local. O arquivo não pode ser alterado
+        até o `flush`; com `delete_after=True` ele é removido após o upload.
+        """
+        size = os.path.getsize(local_path)
+
+        with self._cond:
+            self._ensure_open()
+            self._enqueue(_PendingUpload(
+                seq=self._take_seq(),
+                remote_path=remote_path,
+                size=size,
+                local_path=local_path,
+                delete_after=delete_after,
+            ))
+
+    def submit_bytes(self, data: Buffer, remote_path: str):
+        """
+        Agenda o upload de um buffer em memória, bloqueando enquanto os limites
+        de memória e staging estiverem esgotados.
+        """
+        payload = bytes(data)
+        size = len(payload)
+
+        with self._cond:
+            while True:
+                self._ensure_open()
+
+                if self._memory_used + size <= self.max_memory_bytes:
+                    self._memory_used += size
+                    self._enqueue(_PendingUpload(seq=self._take_seq(), remote_path=remote_path, size=size, data=payload))
+                    return
+
+                # Um item maior que o limite ainda passa quando o staging está vazio
+                if self._staging_used + size <= self.max_staging_bytes or self._staging_used == 0:
+                    self._staging_used += size
+                    break
+
+                self._cond.wait()
+
+        # Escrita em disco fora do lock para não travar os workers
+        try:
+            staged_path = self._write_staging_file(payload)
+        except BaseException:
+            with self._cond:
+                self._staging_used -= size
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._enqueue(_PendingUpload(
+                seq=self._take_seq(),
+                remote_path=remote_path,
+                size=size,
+                local_path=staged_path,
+                staged=True,
+            ))
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Barreira de durabilidade: aguarda todos os uploads submetidos antes
+        desta chamada. Levanta `WriteBehindError` se algum deles falhou.
+        """
+        with self._cond:
+            barrier = self._next_seq - 1
+
+            done = self._cond.wait_for(
+                lambda: not self._outstanding or min(self._outstanding) > barrier,
+                timeout=timeout,
+            )
+            if not done:
+                raise TimeoutError(f"Write-behind flush timed out after {timeout}s")
+
+            if self._failures:
+                failures, self._failures = self._failures, []
+                raise WriteBehindError(failures)
+
+    def close(self):
+        """Drena a fila, encerra os workers e remove o staging temporário."""
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+
+            for thread in self._threads:
+                thread.join()
+
+            if self._owns_staging_dir:
+                shutil.rmtree(self._staging_dir, ignore_errors=True)
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de uploads ainda não concluídos."""
+        with self._cond:
+            return len(self._pending_by_path) + len(self._uploading)
+
+    def __enter__(self) -> "WriteBehindUploader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --------------------------------------------------
+    # INTERNAL (chamados com `_cond` adquirido)
+    # --------------------------------------------------
+
+    def _ensure_open(self):
+        if self._closed:
+            raise RuntimeError("WriteBehindUploader is closed")
+
+    def _take_seq(self) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        return seq
+
+    def _enqueue(self, item: _PendingUpload):
+        superseded = self._pending_by_path.get(item.remote_path)
+        if superseded:
+            # A versão antiga ainda não saiu da fila: a nova a substitui. O seq
+            # antigo segue pendente até a nova versão concluir, para que um
+            # `flush` anterior ao reenvio não retorne sem nenhuma das duas
+            item.replaces = superseded.replaces + [superseded.seq]
+            superseded.replaces = []
+            self._release(superseded)
+            # O arquivo entregue para remoção não será mais enviado; o mesmo
+            # caminho reenviado continua sendo a origem da versão nova
+            if superseded.delete_after and superseded.local_path != item.local_path:
+                self._remove_quietly(superseded.local_path)
+
+        self._pending_by_path[item.remote_path] = item
+        self._outstanding[item.seq] = item
+        self._queue.append(item)
+        self._cond.notify_all()
+
+    def _take_next(self) -> Optional[_PendingUpload]:
+        while self._queue:
+            item = self._queue.popleft()
+
+            # Entradas substituídas continuam na deque, mas saíram do índice.
+            # Com o mesmo caminho em envio, o item sai da deque e fica só no
+            # índice: `_finish` o devolve à fila quando o envio atual terminar
+            if self._pending_by_path.get(item.remote_path) is item and item.remote_path not in self._uploading:
+                del self._pending_by_path[item.remote_path]
+                self._uploading[item.remote_path] = item
+                return item
+
+        return None
+
+    def _finish(self, item: _PendingUpload):
+        del self._uploading[item.remote_path]
+        self._outstanding.pop(item.seq, None)
+        for seq in item.replaces:
+            self._outstanding.pop(seq, None)
+        self._release(item)
+
+        waiting = self._pending_by_path.get(item.remote_path)
+        if waiting is not None:
+            self._queue.append(waiting)
+            self._cond.notify_all()
+
+    def _release(self, item: _PendingUpload):
+        if item.data is not None:
+            self._memory_used -= item.size
+            item.data = None
+        if item.staged:
+            self._staging_used -= item.size
+            self._remove_quietly(item.local_path)
+        self._cond.notify_all()
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed and not self._queue:
+                    return
+                item = self._take_next()
+
+            if item is None:
+                continue
+
+            error = self._upload(item)
+
+            with self._cond:
+                if error is not None:
+                    self._failures.append((item.remote_path, error))
+                elif item.delete_after:
+                    self._remove_quietly(item.local_path)
+
+                self._finish(item)
+
+    def _upload(self, item: _PendingUpload) -> Optional[BaseException]:
+        delay = self.retry_delay
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                if item.data is not None:
+                    self.client.upload_bytes(item.data, item.remote_path, self.chunk_size, None)
+                else:
+                    assert item.local_path is not None
+                    self.client.upload(item.local_path, item.remote_path, self.chunk_size, None)
+                return None
+            except Exception as error:
+                if attempt == self.max_retries:
+                    return error
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+        return None
+
+    def _write_staging_file(self, data: bytes) -> str:
+        fd, path = tempfile.mkstemp(dir=self._staging_dir, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return path
+
+    @staticmethod
+    def _remove_quietly(path: Optional[str]):
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1 +1,2 @@
-from .pub_sub import PubSub
\ No newline at end of file
+from .pub_sub import PubSub
+from .utils.dispatch_queue import OverflowPolicy
\ No newline at end of file
@@ -1,3 +1,4 @@
+from inspect import iscoroutinefunction
 from typing import Type, TypeVar
 from ..pub_sub import PubSub
 from ...types import Args, Callback, Kwargs
@@ -20,6 +21,18 @@ def PubSubMethodAnnotation(cls: Type[T]):
             if callable(attribute) and hasattr(attribute, "_event_topic"):
                 topic = getattr(attribute, "_event_topic")
 
+                if iscoroutinefunction(attribute):
+                    async def async_wrapper(*args: Args, _attribute: Callback = attribute, **kwargs: Kwargs):
+                        try:
+                            await _attribute(self, *args, **kwargs)
+                        except Exception as e:
+                            import traceback
+                            print(f"[CallbackDispatcher] Error running {_attribute.__qualname__}: {e!r}")
+                            traceback.print_exc()
+
+                    PubSub().subscribe(topic, async_wrapper)
+                    continue
+
                 def wrapper(*args: Args, _attribute: Callback = attribute, **kwargs: Kwargs):
                     try:
                         _attribute(self, *args, **kwargs)
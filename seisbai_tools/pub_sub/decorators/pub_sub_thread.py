@@ -1,55 +1,189 @@
-from typing import Any, Optional, Type, TypeVar
+import asyncio
+from concurrent.futures import Future
+from inspect import iscoroutine
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, overload
 from ..pub_sub import PubSub
 from ...types import Args, Callback, Kwargs
 from ...utils import ThreadWithLoop
 
 T = TypeVar("T")
 
-def PubSubThread(cls: Type[T]) -> Type[T | ThreadWithLoop]:
+# Chamada pendente no lote: (função, args, kwargs, future ou None)
+_Call = Tuple[Callback, Tuple[Any, ...], Dict[str, Any], Optional[Future]]
+
+
+class ThreadMethod:
+    """
+    Proxy de um método da instância que roda na thread dona.
+
+    Chamar o proxy retorna um `concurrent.futures.Future` com o resultado;
+    `awaitable(...)` retorna o equivalente aguardável no event loop corrente
+    e `post(...)` apenas enfileira, sem criar future. Na própria thread dona,
+    o método é executado na hora (o future já volta resolvido).
+
+    >>> worker = DownloaderThread(daemon=True); worker.start()
+    >>> worker.download(path).result(timeout=30)
+    >>> size = await worker.size.awaitable(path)
+    """
+    __slots__ = ("_owner", "_name")
+
+    def __init__(self, owner: "ThreadWithLoop", name: str):
+        self._owner = owner
+        self._name = name
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "Future[Any]":
+        future: "Future[Any]" = Future()
+        self._owner._submit(self._owner._call_method, (self._name,) + args, kwargs, future)
+        return future
+
+    def awaitable(self, *args: Any, **kwargs: Any) -> "asyncio.Future[Any]":
+        return asyncio.wrap_future(self(*args, **kwargs))
+
+    def post(self, *args: Any, **kwargs: Any):
+        self._owner._submit(self._owner._call_method, (self._name,) + args, kwargs, None)
+
+    def __repr__(self) -> str:
+        return f"<ThreadMethod {self._name} of {self._owner.name}>"
+
+
+@overload
+def PubSubThread(cls: Type[T]) -> Type[T | ThreadWithLoop]: ...
+@overload
+def PubSubThread(*, batch_calls: bool = False) -> Callable[[Type[T]], Type[T | ThreadWithLoop]]: ...
+
+def PubSubThread(cls: Optional[Type[T]] = None, *, batch_calls: bool = False):
     """Decorator que faz com que a instância da classe rode dentro de uma thread.
 
     Aceita todos os parâmetros padrão do construtor de `threading.Thread`.
+
+    Métodos acessados no wrapper são `ThreadMethod`s (criados uma vez por
+    nome) que retornam `Future`. Com `@PubSubThread(batch_calls=True)`,
+    chamadas consecutivas feitas enquanto a thread está ocupada são
+    agrupadas e executadas em uma única passagem pela fila (útil para
+    handlers de eventos de progresso, que chegam em rajadas).
+
+    Handlers e métodos `async def` rodam até o fim na própria thread, em um
+    event loop privado dela: a thread continua processando uma chamada por
+    vez, e o `Future` recebe o resultado da corrotina.
     """
-    class ThreadedWrapper(ThreadWithLoop):
-        def __init__(self, *args: Args, **kwargs: Kwargs):
-            super().__init__(name=kwargs.get("name", None), daemon=kwargs.get("daemon", None))
+    def decorate(cls: Type[T]) -> Type[T | ThreadWithLoop]:
+        class ThreadedWrapper(ThreadWithLoop):
+            def __init__(self, *args: Args, **kwargs: Kwargs):
+                super().__init__(name=kwargs.get("name", None), daemon=kwargs.get("daemon", None))
+
+                self._init_args = args
+                self._init_kwargs = kwargs
+                self._instance: Optional[T] = None
+                self._proxies: Dict[str, ThreadMethod] = {}
+                self._pending: List[_Call] = []
+                self._pending_lock = Lock()
+                self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+                self.invoke(self._init_instance)
+
+            def run(self):
+                try:
+                    super().run()
+                finally:
+                    if self._loop is not None:
+                        self._loop.close()
+
+            def _init_instance(self):
+                """Cria a instância real da classe dentro da thread."""
+                self._instance = cls(*self._init_args, **self._init_kwargs)
+
+                for attribute_name in dir(self._instance):
+                    attribute: Callback = getattr(self._instance, attribute_name)
+
+                    if callable(attribute) and hasattr(attribute, "_event_topic"):
+                        topic = getattr(attribute, "_event_topic")
+
+                        def wrapper(*args: Args, _attribute: Callback = attribute, **kwargs: Kwargs):
+                            # Sempre pela fila, mesmo publicado da própria thread: o
+                            # handler roda depois da chamada atual, nunca no meio dela
+                            self._submit(self._run, (_attribute,) + args, kwargs, None, inline=False)
+
+                        PubSub().subscribe(topic, wrapper)
+
+            def _call_method(self, name: str, *args: Any, **kwargs: Any) -> Any:
+                return self._run(getattr(self._instance, name), *args, **kwargs)
+
+            def _run(self, func: Callback, *args: Any, **kwargs: Any) -> Any:
+                """Executa `func` na thread; corrotinas rodam até o fim no loop dela."""
+                result = func(*args, **kwargs)
+                if not iscoroutine(result):
+                    return result
+
+                if self._loop is None:
+                    self._loop = asyncio.new_event_loop()
+                if self._loop.is_running():
+                    result.close()
+                    raise RuntimeError(
+                        f"{cls.__name__}.{getattr(func, '__name__', func)} called from a coroutine "
+                        "already running on this thread; await it directly instead"
+                    )
+                return self._loop.run_until_complete(result)
+
+            def _submit(
+                self,
+                func: Callback,
+                args: Tuple[Any, ...],
+                kwargs: Dict[str, Any],
+                future: Optional[Future],
+                inline: bool = True,
+            ):
+                # Chamada explícita (`ThreadMethod`) já na thread dona: executa na
+                # hora, sem passar pela fila (esperar o future ali travaria a thread)
+                if inline and ThreadWithLoop.get_current() is self:
+                    self._execute((func, args, kwargs, future))
+                    return
+
+                if not batch_calls or self._stopping:
+                    self._enqueue(func, args, kwargs, future)
+                    return
+
+                # Só a primeira chamada do lote vai para a fila; as seguintes
+                # pegam carona até a thread drenar o lote
+                with self._pending_lock:
+                    self._pending.append((func, args, kwargs, future))
+                    if len(self._pending) > 1:
+                        return
+                self._enqueue(self._drain_pending, (), {}, None)
+
+            def _drain_pending(self):
+                with self._pending_lock:
+                    pending, self._pending = self._pending, []
+                for call in pending:
+                    self._execute(call)
 
-            self._init_args = args
-            self._init_kwargs = kwargs
-            self._instance: Optional[T] = None
+            def __getattr__(self, name: str):
+                """Intercepta métodos e os executa dentro da thread."""
+                if name in ("_instance", "_proxies"):
+                    raise AttributeError(name)
 
-            self.invoke(self._init_instance)
+                proxy = self._proxies.get(name)
+                if proxy is not None:
+                    return proxy
 
-        def _init_instance(self):
-            """Cria a instância real da classe dentro da thread."""
-            self._instance = cls(*self._init_args, **self._init_kwargs)
+                # Métodos da classe têm proxy mesmo antes de a instância existir:
+                # a chamada entra na fila depois da inicialização
+                if callable(getattr(cls, name, None)):
+                    proxy = self._proxies[name] = ThreadMethod(self, name)
+                    return proxy
 
-            for attribute_name in dir(self._instance):
-                attribute: Callback = getattr(self._instance, attribute_name)
-                
-                if callable(attribute) and hasattr(attribute, "_event_topic"):
-                    topic = getattr(attribute, "_event_topic")
+                if not self._instance:
+                    raise AttributeError(f"Instance of {cls.__name__} has not been initialized yet.")
 
-                    def wrapper(*args: Args, _attribute: Callback = attribute, **kwargs: Kwargs):
-                        self.invoke(_attribute, *args, **kwargs)
-                    
-                    PubSub().subscribe(topic, wrapper)
+                attr: Callback | None = getattr(self._instance, name)
 
-        def __getattr__(self, name: str):
-            """Intercepta métodos e os executa dentro da thread."""
-            if not self._instance:
-                raise AttributeError(f"Instance of {cls.__name__} has not been initialized yet.")
+                if callable(attr):
+                    return ThreadMethod(self, name)
 
-            attr: Callback | None = getattr(self._instance, name)
+                return attr
 
-            if callable(attr):
-                def wrapper(*args: Any, **kwargs: Any):
-                    self.invoke(attr, *args, **kwargs)
+        ThreadedWrapper.__name__ = f"{cls.__name__}Thread"
 
-                return wrapper
-            
-            return attr
+        return ThreadedWrapper
 
-    ThreadedWrapper.__name__ = f"{cls.__name__}Thread"
-    
-    return ThreadedWrapper
\ No newline at end of file
+    return decorate(cls) if cls is not None else decorate
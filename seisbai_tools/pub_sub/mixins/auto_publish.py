@@ -1,9 +1,24 @@
+from typing import Tuple
+
 from msgspec import Struct
 from ..pub_sub import PubSub
 
 
 class AutoPublishMixin:
+    # Caminho raiz -> folha das Structs da hierarquia, calculado uma vez por
+    # classe; um único dispatch alcança os inscritos em qualquer nível ou
+    # padrão (ex.: "Event.*")
+    _topic_path: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._topic_path = tuple(
+            _class.__name__
+            for _class in reversed(cls.__mro__)
+            if issubclass(_class, Struct) and _class is not Struct
+        )
+
     def __post_init__(self):
-        for _class in self.__class__.mro():
-            if issubclass(_class, Struct) and _class is not Struct:
-                PubSub().publish(_class.__name__, self)
\ No newline at end of file
+        if PubSub.is_suppressed():
+            return
+        PubSub().publish_hierarchy(self._topic_path, self)
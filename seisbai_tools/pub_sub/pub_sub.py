@@ -1,34 +1,76 @@
-from queue import Queue
-from threading import Lock, Thread
-from typing import Any, Dict, List, Optional, Self, Tuple, Union, cast
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Self, Set, Tuple, Union
 from uuid import UUID, uuid4
-from weakref import WeakMethod
 from concurrent.futures import ThreadPoolExecutor
 
 from ..types import Args, Callback, Kwargs
+from .utils.async_dispatch import set_default_loop
+from .utils.dispatch_queue import DispatchQueue, Envelope, OverflowPolicy
+from .utils.registry import RegistryWatcher, SubscriberRegistry
+from .utils.topic_trie import TopicPath
+
+# Quantas mensagens podem estar nas lanes (já retiradas da fila, aguardando
+# entrega) ao mesmo tempo. Acima disso o dispatcher espera, e a fila enche,
+# acionando a política de overflow.
+DISPATCH_WINDOW = 256
+
+# Quantas mensagens uma lane entrega antes de devolver a thread ao pool
+LANE_BATCH = 32
+
+# Atributos da mensagem usados como chave de partição, em ordem de preferência
+DEFAULT_PARTITION_ATTRIBUTES = ("correlation_id", "work_id")
+
+# Atributos que identificam mensagens coalescíveis (mais granular primeiro)
+COALESCE_ATTRIBUTES = ("work_id", "correlation_id")
+
+PartitionKey = Callable[[str, Args], Optional[Hashable]]
+
+# Recebe (caminho do tópico, argumentos posicionais) de cada publicação local;
+# usado pelas bridges de transporte para levar mensagens a outros processos
+Forwarder = Callable[[TopicPath, Args], None]
+
+# Profundidade de `PubSub().suppressed()` no contexto atual (thread ou task)
+_suppressed: ContextVar[int] = ContextVar("pub_sub_suppressed", default=0)
+
+# Verdadeiro enquanto um worker do pool entrega mensagens de uma lane
+_in_lane: ContextVar[bool] = ContextVar("pub_sub_in_lane", default=False)
 
 
 class PubSub:
     _instance = None
     _instance_lock = Lock()
-    _subscribers: Dict[str, List[Union[Callback, WeakMethod[Any]]]]
-    _lock: Lock
-    _queue: Queue[Tuple[str, Args, Kwargs] | object]
+    _registry: SubscriberRegistry
+    _queue: DispatchQueue
     _executor: ThreadPoolExecutor
     _dispatcher_thread: Thread
-    _sentinel: object
     _session: UUID
+    _lanes: Dict[Hashable, Deque[Envelope]]
+    _active_lanes: Set[Hashable]
+    _lanes_cond: Condition
+    _in_lanes: int
+    _forwarders: Tuple[Forwarder, ...]
+    _partition_key: PartitionKey
+    _coalesce_key: PartitionKey
 
     def __new__(cls, *args: Args, **kwargs: Kwargs) -> Self:
         with cls._instance_lock:
             if not cls._instance:
                 cls._instance = super().__new__(cls)
-                cls._instance._subscribers = {}
-                cls._instance._lock = Lock()
-                cls._instance._queue = Queue()
-                cls._instance._sentinel = object()
+                cls._instance._registry = SubscriberRegistry()
+                cls._instance._queue = DispatchQueue()
                 cls._instance._session = uuid4()
-                cls._instance._executor = ThreadPoolExecutor(max_workers=4)
+                cls._instance._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="PubSubWorker")
+                cls._instance._lanes = {}
+                cls._instance._active_lanes = set()
+                cls._instance._lanes_cond = Condition()
+                cls._instance._in_lanes = 0
+                cls._instance._forwarders = ()
+                cls._instance._partition_key = cls._attribute_partition_key(DEFAULT_PARTITION_ATTRIBUTES)
+                cls._instance._coalesce_key = cls._attribute_partition_key(COALESCE_ATTRIBUTES)
                 cls._instance._dispatcher_thread = Thread(
                     target=cls._instance._process_events, name="PubSubProcessor", daemon=True
                 )
@@ -36,58 +78,260 @@ class PubSub:
 
         return cls._instance
 
+    def configure(
+        self,
+        max_queue_size: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+        partition_by: Union[Tuple[str, ...], PartitionKey, None] = None,
+        event_loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        """
+        Ajusta a fila do `publish_async`.
+
+        max_queue_size : limite de mensagens pendentes (0 = ilimitado).
+        overflow : política quando a fila está cheia (BLOCK, DROP_OLDEST, COALESCE).
+        partition_by : nomes de atributos da mensagem (o primeiro não-nulo vence)
+            ou função `(topic, args) -> chave` que define as lanes ordenadas.
+            Mensagens sem chave caem na lane do próprio tópico.
+        event_loop : loop dos subscribers `async def` inscritos fora de um
+            loop em execução (ex.: decorators avaliados na importação).
+        """
+        if max_queue_size is not None:
+            self._queue.maxsize = max_queue_size
+        if overflow is not None:
+            self._queue.policy = overflow
+        if partition_by is not None:
+            self._partition_key = (
+                self._attribute_partition_key(partition_by)
+                if isinstance(partition_by, tuple)
+                else partition_by
+            )
+        if event_loop is not None:
+            set_default_loop(event_loop)
+
     def subscribe(self, topic: str, callback: Callback):
-        cb_ref = WeakMethod(callback) if hasattr(callback, "__self__") else callback
-        with self._lock:
-            self._subscribers.setdefault(topic, []).append(cb_ref)
+        """
+        Inscreve `callback` em `topic`. Callbacks `async def` não rodam na
+        thread de quem publica: viram tasks no event loop em execução na
+        inscrição, acordado uma vez por lote de publicações.
+        """
+        self._registry.add(topic, callback)
 
     def unsubscribe(self, topic: str, callback: Callback):
-        with self._lock:
-            if topic in self._subscribers:
-                self._subscribers[topic] = [
-                    cb_ref for cb_ref in self._subscribers[topic]
-                    if not self._compare_callback(cb_ref, callback)
-                ]
-                if not self._subscribers[topic]:
-                    del self._subscribers[topic]
+        self._registry.remove(topic, callback)
+
+    def subscriber_count(self, topic: str) -> int:
+        return self._registry.count(topic)
+
+    def has_subscribers(self, topic: str) -> bool:
+        return self._registry.count(topic) > 0
+
+    def subscription_counts(self) -> Dict[str, int]:
+        """Contagem de subscribers por tópico (nomes exatos e padrões)."""
+        return self._registry.counts()
+
+    def watch_subscriptions(self, watcher: RegistryWatcher):
+        """Chama `watcher(tópico, contagem)` a cada subscribe/unsubscribe."""
+        self._registry.watch(watcher)
+
+    def unwatch_subscriptions(self, watcher: RegistryWatcher):
+        self._registry.unwatch(watcher)
+
+    def add_forwarder(self, forwarder: Forwarder):
+        """
+        Registra um encaminhador chamado com `(caminho, args)` a cada
+        publicação local, depois da entrega aos subscribers locais. Apenas
+        argumentos posicionais são encaminhados.
+        """
+        with self._instance_lock:
+            self._forwarders = self._forwarders + (forwarder,)
+
+    def remove_forwarder(self, forwarder: Forwarder):
+        with self._instance_lock:
+            self._forwarders = tuple(f for f in self._forwarders if f is not forwarder)
 
     def publish(self, topic: str, *args: Args, **kwargs: Kwargs):
-        with self._lock:
-            subscribers = self._subscribers.get(topic, []).copy()
+        # Snapshot imutável: sem lock e sem cópia; tópico vazio sai aqui
+        for subscriber in self._registry.get(topic):
+            callback = subscriber.resolve()
+            if callback:
+                self._safe_call(callback, *args, **kwargs)
+
+        if self._forwarders:
+            self._forward((topic,), args)
 
-        for cb_ref in subscribers:
-            callback = self._resolve_callback(cb_ref)
+    def publish_hierarchy(self, path: TopicPath, *args: Args, **kwargs: Kwargs):
+        """
+        Publica uma única vez para um caminho hierárquico de tópicos
+        (raiz -> folha, ex.: `("Base", "Event", "ProgressUpdatedEvent")`).
+
+        Cada subscriber recebe a mensagem uma vez, seja inscrito no nome exato
+        de algum nível ou em um padrão como `Event.*`; o conjunto é resolvido
+        uma vez por caminho e reaproveitado até o registro mudar.
+        """
+        for subscriber in self._registry.get_path(path):
+            callback = subscriber.resolve()
             if callback:
                 self._safe_call(callback, *args, **kwargs)
 
+        if self._forwarders:
+            self._forward(path, args)
+
+    def publish_many(self, messages: Iterable[Any]):
+        """
+        Publica em lote mensagens construídas sem efeitos colaterais (ver
+        `suppressed`), na ordem recebida. Cada mensagem segue o caminho
+        hierárquico da sua classe; os subscribers são resolvidos uma vez por
+        classe distinta no lote.
+        """
+        resolved: Dict[type, Tuple[TopicPath, List[Callback]]] = {}
+
+        for message in messages:
+            cls = type(message)
+            entry = resolved.get(cls)
+
+            if entry is None:
+                path = getattr(cls, "_topic_path", None) or (cls.__name__,)
+                callbacks = [cb for cb in (s.resolve() for s in self._registry.get_path(path)) if cb]
+                entry = resolved[cls] = (path, callbacks)
+
+            path, callbacks = entry
+            for callback in callbacks:
+                self._safe_call(callback, message)
+
+            if self._forwarders:
+                self._forward(path, (message,))
+
+    @contextmanager
+    def suppressed(self) -> Iterator[None]:
+        """
+        Dentro do bloco, construir comandos/eventos não publica nem registra
+        log (desserialização, replays, testes). Vale para a thread ou task
+        atual; blocos podem ser aninhados.
+
+        >>> with PubSub().suppressed():
+        ...     events = [deserialize(raw) for raw in batch]
+        >>> PubSub().publish_many(events)
+        """
+        token = _suppressed.set(_suppressed.get() + 1)
+        try:
+            yield
+        finally:
+            _suppressed.reset(token)
+
+    @staticmethod
+    def is_suppressed() -> bool:
+        return _suppressed.get() > 0
+
+    def publish_async(self, topic: Union[str, TopicPath], *args: Args, **kwargs: Kwargs):
+        """
+        Publica sem executar os subscribers na thread do publicador.
+
+        `topic` é um nome ou um caminho hierárquico (raiz -> folha); a entrega
+        resolve os subscribers como `publish_hierarchy` (nomes de cada nível e
+        padrões). Chaves de partição e de coalescência usam o nome da folha.
+
+        A mensagem entra na fila limitada e é entregue pelo pool de workers em
+        lanes ordenadas: mensagens com a mesma chave de partição (por padrão
+        `correlation_id` ou `work_id`, ver `configure(partition_by=...)`) são
+        entregues em série e na ordem de publicação, mesmo em tópicos
+        diferentes (Started -> Progress -> Completed); chaves diferentes são
+        entregues em paralelo. Sem chave, a lane é o tópico. Com a fila
+        cheia vale a política configurada em `configure(overflow=...)`: na
+        COALESCE, mensagens com o mesmo tópico e `work_id`/`correlation_id`
+        substituem a pendente.
+
+        Chamado de um handler que já roda em um worker do pool, nunca espera
+        por espaço na fila (esperar ali poderia travar o próprio pool): a
+        mensagem entra mesmo acima do limite.
+        """
+        path: TopicPath = (topic,) if isinstance(topic, str) else tuple(topic)
+        if not self._registry.get_path(path) and not self._forwarders:
+            return
+
+        name = path[-1]
+        key = self._partition_key(name, args)
+        lane = ("key", key) if key is not None else ("topic", name)
+        # Sem `work_id`/`correlation_id` não há como saber se duas mensagens
+        # são a mesma: nunca coalescem
+        coalesce = self._coalesce_key(name, args)
+        envelope = Envelope(path, args, kwargs, (name, coalesce) if coalesce is not None else None, lane)
+        self._queue.put(envelope, wait=not _in_lane.get())
+
     def stop(self):
-        self._queue.put(self._sentinel)
+        self._queue.close()
         self._dispatcher_thread.join(timeout=1)
         self._executor.shutdown(wait=False)
 
     def session(self) -> UUID:
         return self._session
 
+    def stats(self) -> Dict[str, Any]:
+        """Estado da fila assíncrona (tamanho, descartes, coalescências)."""
+        return self._queue.stats()
+
     def _process_events(self):
         while True:
-            item = self._queue.get()
-            
-            if item is self._sentinel:
+            envelope = self._queue.get()
+
+            if envelope is None:
                 break
 
-            if item is None:
-                continue
+            lane = envelope.lane
 
-            topic, args, kwargs = cast(Tuple[str, Args, Kwargs], item)
-            
-            with self._lock:
-                subscribers = self._subscribers.get(topic, []).copy()
+            with self._lanes_cond:
+                # Janela limitada: enquanto as lanes estão cheias, a fila
+                # principal acumula e a política de overflow atua nela
+                self._lanes_cond.wait_for(lambda: self._in_lanes < DISPATCH_WINDOW)
 
-            for cb_ref in subscribers:
-                callback = self._resolve_callback(cb_ref)
-                if callback:
-                    # executa em thread pool para não travar o loop
-                    self._executor.submit(self._safe_call, callback, *args, **kwargs)
+                self._lanes.setdefault(lane, deque()).append(envelope)
+                self._in_lanes += 1
+
+                if lane in self._active_lanes:
+                    continue
+                self._active_lanes.add(lane)
+
+            # executa em thread pool para não travar o loop
+            self._schedule_lane(lane)
+
+    def _drain_lane(self, lane: Hashable):
+        """Entrega em série as mensagens de uma lane; só uma execução por lane."""
+        token = _in_lane.set(True)
+        try:
+            for _ in range(LANE_BATCH):
+                with self._lanes_cond:
+                    pending = self._lanes.get(lane)
+
+                    if not pending:
+                        self._lanes.pop(lane, None)
+                        self._active_lanes.discard(lane)
+                        return
+
+                    envelope = pending.popleft()
+                    self._in_lanes -= 1
+                    self._lanes_cond.notify_all()
+
+                self.publish_hierarchy(envelope.topic, *envelope.args, **envelope.kwargs)
+        finally:
+            _in_lane.reset(token)
+
+        # Devolve a thread ao pool para não monopolizá-lo; a lane continua ativa
+        self._schedule_lane(lane)
+
+    def _schedule_lane(self, lane: Hashable):
+        try:
+            self._executor.submit(self._drain_lane, lane)
+        except RuntimeError:
+            # Pool encerrado por `stop()`: a lane não será mais drenada
+            with self._lanes_cond:
+                pending = self._lanes.pop(lane, None)
+                self._active_lanes.discard(lane)
+                self._in_lanes -= len(pending) if pending else 0
+                self._lanes_cond.notify_all()
+
+    def _forward(self, path: TopicPath, args: Args):
+        for forwarder in self._forwarders:
+            self._safe_call(forwarder, path, args)
 
     def _safe_call(self, callback: Callback, *args: Args, **kwargs: Kwargs):
         try:
@@ -96,10 +340,12 @@ class PubSub:
             print(f"[PubSub] Error running {callback}: {error}")
 
     @staticmethod
-    def _resolve_callback(cb_ref: Union[Callback, WeakMethod[Any]]) -> Optional[Callback]:
-        return cb_ref() if isinstance(cb_ref, WeakMethod) else cb_ref
-
-    @staticmethod
-    def _compare_callback(cb_ref: Union[Callback, WeakMethod[Any]], callback: Callback) -> bool:
-        resolved = PubSub._resolve_callback(cb_ref)
-        return resolved is callback
\ No newline at end of file
+    def _attribute_partition_key(attributes: Tuple[str, ...]) -> PartitionKey:
+        def partition_key(topic: str, args: Args) -> Optional[Hashable]:
+            if args:
+                for attribute in attributes:
+                    value = getattr(args[0], attribute, None)
+                    if value is not None:
+                        return value
+            return None
+        return partition_key
@@ -0,0 +1,2 @@
+from .bridge import PubSubBridge
+from .broker import Broker
@@ -0,0 +1,59 @@
+import os
+import socket
+from typing import Tuple, Union
+
+SockAddr = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: str) -> Tuple[int, SockAddr]:
+    """
+    Converte um endereço textual em `(família, sockaddr)`.
+
+    - `tcp://host:porta` : TCP (entre hosts);
+    - `unix:///caminho` ou apenas `/caminho` : socket Unix (mesmo host).
+    """
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid TCP address: {address}")
+        return socket.AF_INET, (host.strip("[]"), int(port))
+
+    if address.startswith("unix://"):
+        address = address[len("unix://"):]
+    return socket.AF_UNIX, address
+
+
+def connect(address: str, timeout: float = 5.0) -> socket.socket:
+    family, sockaddr = parse_address(address)
+
+    if family == socket.AF_UNIX:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(sockaddr)
+    else:
+        sock = socket.create_connection(sockaddr, timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    sock.settimeout(None)
+    return sock
+
+
+def listen(address: str) -> socket.socket:
+    family, sockaddr = parse_address(address)
+
+    if family == socket.AF_UNIX:
+        if os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+    server.bind(sockaddr)
+    server.listen()
+    return server
+
+
+def configure_accepted(sock: socket.socket):
+    if sock.family == socket.AF_INET:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
@@ -0,0 +1,268 @@
+import socket
+from collections import Counter
+from contextvars import ContextVar
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ...types import Args
+from ...utils.codec import decode_many, encode_many
+from ..pub_sub import PubSub
+from ..utils.topic_trie import TopicPath, TopicTrie, split_pattern
+from .address import connect
+from .framing import PUBLISH, SUBSCRIBE, UNSUBSCRIBE, FrameError, FrameReader, encode_frame, expand
+from .writer import FrameWriter
+
+# Mensagem recebida do transporte sendo entregue no contexto atual: só ela
+# (mesmo caminho e mesmos objetos) deixa de ser reenviada. Publicações feitas
+# pelos handlers durante a entrega (ex.: comando -> evento) seguem normalmente
+_inbound: ContextVar[Optional[Tuple[TopicPath, List[Any]]]] = ContextVar("pub_sub_inbound", default=None)
+
+Encode = Callable[[List[Any]], bytes]
+Decode = Callable[[bytes], List[Any]]
+
+
+class PubSubBridge:
+    """
+    Liga o `PubSub` deste processo a um `Broker`, por socket Unix (mesmo
+    host) ou TCP (`tcp://host:porta`).
+
+    - Inscrições locais (subscribe/unsubscribe) são repassadas ao broker, que
+      as anuncia aos outros processos.
+    - Publicações locais só saem do processo quando algum outro processo tem
+      subscriber para o caminho do tópico (nome exato ou padrão).
+    - Mensagens recebidas são entregues localmente com `publish_hierarchy`,
+      reconstruídas sem efeitos colaterais e sem voltar para o broker.
+
+    Apenas argumentos posicionais atravessam o transporte; o payload usa o
+    codec msgpack de `utils.codec` por padrão (ver `encode`/`decode`).
+
+    A saída é enviada em lotes e comprimida (zlib) acima de
+    `compress_threshold` bytes, com fila limitada a `max_queue_bytes`: sem
+    espaço, as publicações mais antigas são descartadas (ver `stats`). Se a
+    conexão cai, a bridge reconecta com backoff exponencial e reanuncia as
+    inscrições; o que foi publicado nesse intervalo aguarda na fila.
+
+    Exemplo
+    -------
+    >>> with PubSubBridge("/tmp/seisbai.sock"):
+    ...     run_worker()
+    """
+
+    def __init__(
+        self,
+        address: str,
+        encode: Optional[Encode] = None,
+        decode: Optional[Decode] = None,
+        pub_sub: Optional[PubSub] = None,
+        max_queue_bytes: int = 64 * 1024 * 1024,
+        batch_bytes: int = 1024 * 1024,
+        compress_threshold: int = 16 * 1024,
+        reconnect_delay: float = 0.1,
+        max_reconnect_delay: float = 5.0,
+    ):
+        self.address = address
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.encode = encode or encode_many
+        self.decode = decode or decode_many
+        self.pub_sub = pub_sub or PubSub()
+
+        self._remote_topics: Counter[str] = Counter()
+        self._remote = TopicTrie()
+        self._routes: Dict[TopicPath, bool] = {}
+        self._announced: Set[str] = set()
+        self._lock = Lock()
+
+        self._writer = FrameWriter(
+            "PubSubBridgeWriter",
+            max_bytes=max_queue_bytes,
+            batch_bytes=batch_bytes,
+            compress_threshold=compress_threshold,
+        )
+        self._sock: Optional[socket.socket] = None
+        self._closing = Event()
+        self._connected = Event()
+        self.reconnects = 0
+
+        # A primeira conexão acontece aqui: endereço errado falha cedo
+        self._attach(connect(address))
+
+        self._reader_thread = Thread(target=self._connection_loop, name="PubSubBridgeReader", daemon=True)
+        self._reader_thread.start()
+
+        # Anuncia o que já existe e passa a acompanhar as mudanças
+        self.pub_sub.watch_subscriptions(self._on_subscription)
+        for topic, count in self.pub_sub.subscription_counts().items():
+            self._on_subscription(topic, count)
+
+        self.pub_sub.add_forwarder(self._forward)
+
+    def close(self):
+        if self._closing.is_set():
+            return
+        self._closing.set()
+
+        self.pub_sub.remove_forwarder(self._forward)
+        self.pub_sub.unwatch_subscriptions(self._on_subscription)
+
+        # O writer drena o que já estava na fila antes de fechar o socket
+        self._writer.close()
+
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self._reader_thread.join(timeout=5)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._connected.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Fila de saída (pendentes, descartes, enviados) e reconexões."""
+        stats = self._writer.stats()
+        stats.update(connected=self.connected, reconnects=self.reconnects)
+        return stats
+
+    def __enter__(self) -> "PubSubBridge":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --------------------------------------------------
+    # SAÍDA
+    # --------------------------------------------------
+
+    def _on_subscription(self, topic: str, count: int):
+        # Só interessam ao broker as transições com/sem subscribers
+        with self._lock:
+            if count and topic not in self._announced:
+                self._announced.add(topic)
+                self._writer.put(encode_frame(SUBSCRIBE, topic), droppable=False)
+            elif not count and topic in self._announced:
+                self._announced.discard(topic)
+                self._writer.put(encode_frame(UNSUBSCRIBE, topic), droppable=False)
+
+    def _forward(self, path: TopicPath, args: Args):
+        if self._is_inbound(path, args) or not self._wanted(path):
+            return
+        self._writer.put(encode_frame(PUBLISH, path, self.encode(list(args))))
+
+    @staticmethod
+    def _is_inbound(path: TopicPath, args: Args) -> bool:
+        inbound = _inbound.get()
+        if inbound is None:
+            return False
+        inbound_path, inbound_args = inbound
+        return (
+            path == inbound_path
+            and len(args) == len(inbound_args)
+            and all(arg is inbound_arg for arg, inbound_arg in zip(args, inbound_args))
+        )
+
+    def _wanted(self, path: TopicPath) -> bool:
+        routes = self._routes
+        wanted = routes.get(path)
+        if wanted is None:
+            with self._lock:
+                wanted = bool(self._remote.match(path))
+                self._routes[path] = wanted
+        return wanted
+
+    # --------------------------------------------------
+    # ENTRADA
+    # --------------------------------------------------
+
+    def _connection_loop(self):
+        delay = self.reconnect_delay
+
+        while not self._closing.is_set():
+            sock = self._sock
+            if sock is not None:
+                self._read_until_closed(sock)
+                self._detach()
+                if self._closing.is_set():
+                    return
+
+            try:
+                self._attach(connect(self.address))
+                self.reconnects += 1
+                delay = self.reconnect_delay
+            except OSError:
+                self._closing.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _read_until_closed(self, sock: socket.socket):
+        reader = FrameReader(sock)
+
+        try:
+            while True:
+                frame = reader.read()
+                if frame is None:
+                    return
+                for inner in expand(frame, reader.max_frame_size):
+                    self._handle(inner)
+        except (OSError, FrameError):
+            return
+
+    def _attach(self, sock: socket.socket):
+        with self._lock:
+            # O broker reenvia as inscrições remotas a cada nova conexão
+            self._remote_topics.clear()
+            self._remote = TopicTrie()
+            self._routes = {}
+            announced = [encode_frame(SUBSCRIBE, topic) for topic in self._announced]
+
+        self._writer.replace_control(announced)
+        self._sock = sock
+        self._writer.attach(sock)
+        self._connected.set()
+
+    def _detach(self):
+        self._connected.clear()
+        self._writer.detach()
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _handle(self, frame: List[Any]):
+        kind = frame[0]
+
+        if kind == PUBLISH:
+            path = tuple(frame[1])
+            try:
+                args = self.decode(frame[2])
+            except Exception as error:
+                # Ex.: segmento de memória compartilhada já removido pelo dono;
+                # descarta só esta mensagem, sem derrubar a conexão
+                print(f"[PubSubBridge] Dropping message for {'.'.join(path)}: {error}")
+                return
+            token = _inbound.set((path, args))
+            try:
+                self.pub_sub.publish_hierarchy(path, *args)
+            finally:
+                _inbound.reset(token)
+            return
+
+        topic = frame[1]
+        with self._lock:
+            if kind == SUBSCRIBE:
+                self._remote_topics[topic] += 1
+                if self._remote_topics[topic] == 1:
+                    self._remote.add(split_pattern(topic), topic)
+            elif kind == UNSUBSCRIBE and self._remote_topics[topic] > 0:
+                self._remote_topics[topic] -= 1
+                if not self._remote_topics[topic]:
+                    del self._remote_topics[topic]
+                    self._remote.remove(split_pattern(topic), lambda _: True)
+            self._routes = {}
@@ -0,0 +1,214 @@
+import argparse
+import os
+import socket
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Set
+
+from ..utils.topic_trie import TopicPath, TopicTrie, split_pattern
+from .address import configure_accepted, listen, parse_address
+from .framing import PUBLISH, SUBSCRIBE, UNSUBSCRIBE, FrameError, FrameReader, encode_frame, expand
+from .writer import FrameWriter
+
+
+class _Connection:
+    __slots__ = ("sock", "topics", "trie", "writer", "routes")
+
+    def __init__(self, sock: socket.socket, writer: FrameWriter):
+        self.sock = sock
+        self.topics: Set[str] = set()
+        self.trie: TopicTrie = TopicTrie()
+        self.writer = writer
+        # Cache caminho -> interessado?; descartado quando as inscrições mudam
+        self.routes: Dict[TopicPath, bool] = {}
+
+    def wants(self, path: TopicPath) -> bool:
+        routes = self.routes
+        wanted = routes.get(path)
+        if wanted is None:
+            wanted = routes[path] = bool(self.trie.match(path))
+        return wanted
+
+
+class Broker:
+    """
+    Broker que conecta as `PubSubBridge` de vários processos, no mesmo host
+    (socket Unix) ou entre hosts (`tcp://host:porta`).
+
+    Cada conexão informa os tópicos em que seus subscribers locais estão
+    inscritos; o broker repassa essas inscrições às demais conexões (para que
+    só publiquem o que alguém consome) e entrega cada publicação apenas às
+    conexões interessadas, sem decodificar o payload. A saída de cada conexão
+    é limitada em memória: um consumidor lento perde as publicações mais
+    antigas, sem travar os demais.
+
+    Também roda como processo isolado, útil em testes:
+
+        python -m seisbai_tools.pub_sub.transport.broker tcp://127.0.0.1:5560
+
+    Exemplo
+    -------
+    >>> broker = Broker("/tmp/seisbai.sock").start()
+    >>> bridge = PubSubBridge("/tmp/seisbai.sock")   # em cada processo
+    """
+
+    def __init__(self, address: str, max_queue_bytes: int = 64 * 1024 * 1024):
+        self.address = address
+        self.max_queue_bytes = max_queue_bytes
+        self._server: Optional[socket.socket] = None
+        self._connections: List[_Connection] = []
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> "Broker":
+        """Escuta em background (thread daemon)."""
+        self._server = listen(self.address)
+        self._thread = Thread(target=self._accept_loop, name="PubSubBroker", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server = listen(self.address)
+        self._accept_loop()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server:
+            server.close()
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.writer.close(timeout=1)
+            self._close_quietly(connection.sock)
+
+        family, sockaddr = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+
+    def __enter__(self) -> "Broker":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _accept_loop(self):
+        while self._server is not None:
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                break
+
+            configure_accepted(sock)
+            writer = FrameWriter("PubSubBrokerWriter", max_bytes=self.max_queue_bytes)
+            connection = _Connection(sock, writer)
+
+            with self._lock:
+                # O recém-chegado conhece as inscrições já existentes
+                for other in self._connections:
+                    for topic in other.topics:
+                        writer.put(encode_frame(SUBSCRIBE, topic), droppable=False)
+                self._connections.append(connection)
+
+            writer.attach(sock)
+            Thread(target=self._serve, args=(connection,), name="PubSubBrokerConnection", daemon=True).start()
+
+    def _serve(self, connection: _Connection):
+        reader = FrameReader(connection.sock)
+
+        try:
+            while True:
+                frame = reader.read()
+                if frame is None:
+                    break
+                for inner in expand(frame, reader.max_frame_size):
+                    self._handle(connection, inner)
+        except (OSError, FrameError):
+            pass
+        finally:
+            self._disconnect(connection)
+
+    def _handle(self, connection: _Connection, frame: list):
+        kind = frame[0]
+
+        if kind == PUBLISH:
+            path = tuple(frame[1])
+            raw: Optional[bytes] = None
+            for other in self._snapshot():
+                if other is not connection and other.wants(path):
+                    raw = raw or encode_frame(*frame)
+                    other.writer.put(raw)
+            return
+
+        if kind not in (SUBSCRIBE, UNSUBSCRIBE):
+            return
+
+        topic = frame[1]
+        with self._lock:
+            if kind == SUBSCRIBE:
+                if topic in connection.topics:
+                    return
+                connection.topics.add(topic)
+                connection.trie.add(split_pattern(topic), topic)
+            else:
+                if topic not in connection.topics:
+                    return
+                connection.topics.discard(topic)
+                connection.trie.remove(split_pattern(topic), lambda _: True)
+            connection.routes = {}
+            others = [c for c in self._connections if c is not connection]
+
+        raw = encode_frame(kind, topic)
+        for other in others:
+            other.writer.put(raw, droppable=False)
+
+    def _disconnect(self, connection: _Connection):
+        with self._lock:
+            if connection not in self._connections:
+                return
+            self._connections.remove(connection)
+            topics = list(connection.topics)
+            others = list(self._connections)
+
+        # Inscrições do processo que saiu deixam de valer para os demais
+        for topic in topics:
+            raw = encode_frame(UNSUBSCRIBE, topic)
+            for other in others:
+                other.writer.put(raw, droppable=False)
+
+        connection.writer.close(timeout=0)
+        self._close_quietly(connection.sock)
+
+    def _snapshot(self) -> List[_Connection]:
+        with self._lock:
+            return list(self._connections)
+
+    @staticmethod
+    def _close_quietly(sock: socket.socket):
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broker local para PubSubBridge")
+    parser.add_argument("address", help="tcp://host:porta ou caminho de socket Unix")
+    parser.add_argument("--max-queue-mb", type=int, default=64, help="Limite da fila de saída por conexão")
+    args = parser.parse_args()
+
+    broker = Broker(args.address, max_queue_bytes=args.max_queue_mb * 1024 * 1024)
+    print(f"[Broker] Listening on {args.address}", flush=True)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import socket
+import struct
+import zlib
+from typing import Any, Iterator, List, Optional
+
+import msgspec
+
+# Tipos de frame trocados entre bridges e broker
+SUBSCRIBE = "sub"      # ["sub", tópico]
+UNSUBSCRIBE = "unsub"  # ["unsub", tópico]
+PUBLISH = "pub"        # ["pub", [segmentos do caminho], payload]
+COMPRESSED = "z"       # ["z", zlib(frames concatenados)]
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder(list)
+
+
+class FrameError(ConnectionError):
+    """Frame malformado ou maior que `MAX_FRAME_SIZE`."""
+
+
+def encode_frame(*fields: Any) -> bytes:
+    """Frame = tamanho (4 bytes, big-endian) + lista msgpack."""
+    body = _encoder.encode(fields)
+    return _HEADER.pack(len(body)) + body
+
+
+def compress_frames(frames: bytes, level: int = 1) -> bytes:
+    """Empacota vários frames já codificados em um único frame comprimido."""
+    return encode_frame(COMPRESSED, zlib.compress(frames, level))
+
+
+def iter_bodies(data: bytes) -> Iterator[bytes]:
+    """Corpos dos frames concatenados em `data` (conteúdo de um frame `z`)."""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        (size,) = _HEADER.unpack_from(view, offset)
+        start = offset + _HEADER.size
+        offset = start + size
+        if offset > len(view):
+            raise FrameError("Truncated frame inside compressed batch")
+        yield bytes(view[start:offset])
+
+
+def expand(frame: List[Any], max_size: int = MAX_FRAME_SIZE) -> Iterator[List[Any]]:
+    """
+    Frames contidos em `frame`: ele mesmo ou, se comprimido, os internos.
+    O conteúdo descomprimido é limitado a `max_size` bytes, como um frame
+    comum: um frame pequeno não pode se expandir sem limite.
+    """
+    if frame[0] != COMPRESSED:
+        yield frame
+        return
+    try:
+        inflater = zlib.decompressobj()
+        data = inflater.decompress(frame[1], max_size)
+        if inflater.unconsumed_tail or not inflater.eof:
+            raise FrameError(f"Compressed frame truncated or larger than {max_size} bytes")
+    except (zlib.error, TypeError) as error:
+        raise FrameError(f"Invalid compressed frame: {error}") from error
+    for body in iter_bodies(data):
+        yield decode_body(body)
+
+
+def decode_body(body: bytes) -> List[Any]:
+    try:
+        return _decoder.decode(body)
+    except msgspec.DecodeError as error:
+        raise FrameError(f"Invalid frame: {error}") from error
+
+
+class FrameReader:
+    """Lê frames completos de um socket, acumulando leituras parciais."""
+
+    def __init__(self, sock: socket.socket, read_size: int = 256 * 1024, max_frame_size: int = MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._sock = sock
+        self._read_size = read_size
+        self._buffer = bytearray()
+
+    def read_body(self) -> Optional[bytes]:
+        """Corpo do próximo frame, sem decodificar; None quando a conexão fecha."""
+        while True:
+            if len(self._buffer) >= _HEADER.size:
+                (size,) = _HEADER.unpack_from(self._buffer)
+                if size > self.max_frame_size:
+                    raise FrameError(f"Frame of {size} bytes exceeds limit")
+
+                end = _HEADER.size + size
+                if len(self._buffer) >= end:
+                    body = bytes(self._buffer[_HEADER.size:end])
+                    del self._buffer[:end]
+                    return body
+
+            chunk = self._sock.recv(self._read_size)
+            if not chunk:
+                return None
+            self._buffer += chunk
+
+    def read(self) -> Optional[List[Any]]:
+        body = self.read_body()
+        return decode_body(body) if body is not None else None
@@ -0,0 +1,157 @@
+import socket
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .framing import compress_frames
+
+
+class FrameWriter:
+    """
+    Fila de saída limitada, com envio em lote e compressão, para um socket.
+
+    - Memória limitada: acima de `max_bytes`, as publicações pendentes mais
+      antigas são descartadas; frames de controle (inscrições) nunca são.
+    - Lote: tudo o que estiver pendente (até `batch_bytes`) sai em um único
+      `sendall`; lotes a partir de `compress_threshold` bytes viram um frame
+      `z` comprimido com zlib.
+    - Sem socket (desconectado), os frames aguardam na fila até `attach`; um
+      lote que falhou no envio volta para o início da fila.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        batch_bytes: int = 1024 * 1024,
+        compress_threshold: int = 16 * 1024,
+        compress_level: int = 1,
+    ):
+        self.max_bytes = max_bytes
+        self.batch_bytes = batch_bytes
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+        self.dropped = 0
+        self.sent_frames = 0
+        self.sent_bytes = 0
+
+        # (frame, descartável)
+        self._items: Deque[Tuple[bytes, bool]] = deque()
+        self._size = 0
+        self._sock: Optional[socket.socket] = None
+        self._closed = False
+        self._cond = Condition()
+
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # --------------------------------------------------
+    # API
+    # --------------------------------------------------
+
+    def put(self, frame: bytes, droppable: bool = True):
+        with self._cond:
+            if self._closed:
+                return
+            self._items.append((frame, droppable))
+            self._size += len(frame)
+            self._enforce_limit()
+            self._cond.notify_all()
+
+    def replace_control(self, frames: Iterable[bytes]):
+        """
+        Descarta os frames de controle pendentes e coloca `frames` à frente
+        da fila (reanúncio das inscrições após reconectar).
+        """
+        frames = list(frames)
+        with self._cond:
+            kept = [item for item in self._items if item[1]]
+            self._items = deque([(frame, False) for frame in frames] + kept)
+            self._size = sum(len(frame) for frame, _ in self._items)
+            self._cond.notify_all()
+
+    def attach(self, sock: socket.socket):
+        with self._cond:
+            self._sock = sock
+            self._cond.notify_all()
+
+    def detach(self):
+        with self._cond:
+            self._sock = None
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Envia o que estiver pendente (se conectado) e encerra a thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending_frames": len(self._items),
+                "pending_bytes": self._size,
+                "dropped": self.dropped,
+                "sent_frames": self.sent_frames,
+                "sent_bytes": self.sent_bytes,
+            }
+
+    # --------------------------------------------------
+    # INTERNAL
+    # --------------------------------------------------
+
+    def _enforce_limit(self):
+        if self._size <= self.max_bytes:
+            return
+
+        kept: Deque[Tuple[bytes, bool]] = deque()
+        for frame, droppable in self._items:
+            if droppable and self._size > self.max_bytes:
+                self._size -= len(frame)
+                self.dropped += 1
+            else:
+                kept.append((frame, droppable))
+        self._items = kept
+
+    def _take_batch(self) -> List[Tuple[bytes, bool]]:
+        batch: List[Tuple[bytes, bool]] = []
+        size = 0
+        while self._items and (not batch or size + len(self._items[0][0]) <= self.batch_bytes):
+            item = self._items.popleft()
+            size += len(item[0])
+            batch.append(item)
+        self._size -= size
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: (self._items and self._sock is not None) or self._closed)
+                if self._closed and (not self._items or self._sock is None):
+                    return
+                sock = self._sock
+                batch = self._take_batch()
+                self._cond.notify_all()
+
+            data = b"".join(frame for frame, _ in batch)
+            if len(data) >= self.compress_threshold:
+                data = compress_frames(data, self.compress_level)
+
+            try:
+                assert sock is not None
+                sock.sendall(data)
+            except OSError:
+                with self._cond:
+                    # Devolve o lote; o dono reconecta e chama `attach`
+                    self._items.extendleft(reversed(batch))
+                    self._size += sum(len(frame) for frame, _ in batch)
+                    if self._sock is sock:
+                        self._sock = None
+                    if self._closed:
+                        return
+                continue
+
+            with self._cond:
+                self.sent_frames += len(batch)
+                self.sent_bytes += len(data)
@@ -0,0 +1,135 @@
+import asyncio
+from collections import deque
+from inspect import iscoroutinefunction
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from ...types import Callback
+
+# Quantas entregas um único callback do loop agenda antes de devolver o
+# controle ao loop (I/O e timers continuam andando durante rajadas)
+LOOP_BATCH = 1024
+
+_Delivery = Tuple[Callback, Tuple[Any, ...], Dict[str, Any]]
+
+# Loop usado por subscribers `async def` inscritos fora de um loop em execução
+# (ex.: decorators avaliados na importação); ver `PubSub().configure(event_loop=...)`
+_default_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_dispatchers: "WeakKeyDictionary[asyncio.AbstractEventLoop, LoopDispatcher]" = WeakKeyDictionary()
+_dispatchers_lock = Lock()
+
+
+def is_async_callback(callback: Callback) -> bool:
+    return iscoroutinefunction(callback)
+
+
+def set_default_loop(loop: Optional[asyncio.AbstractEventLoop]):
+    global _default_loop
+    _default_loop = loop
+
+
+def registration_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Loop em execução na thread atual, se houver."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def dispatcher_for(loop: asyncio.AbstractEventLoop) -> "LoopDispatcher":
+    dispatcher = _dispatchers.get(loop)
+    if dispatcher is None:
+        with _dispatchers_lock:
+            dispatcher = _dispatchers.get(loop)
+            if dispatcher is None:
+                dispatcher = _dispatchers[loop] = LoopDispatcher(loop)
+    return dispatcher
+
+
+class LoopDispatcher:
+    """
+    Entrega chamadas de subscribers `async def` em um event loop.
+
+    Publicações de outras threads entram em uma fila e acordam o loop com
+    um único `call_soon_threadsafe` por lote: enquanto o lote não é drenado,
+    novas entregas só são anexadas. No loop, cada entrega vira uma task, na
+    ordem de publicação.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._pending: Deque[_Delivery] = deque()
+        self._scheduled = False
+        self._lock = Lock()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+    def submit(self, func: Callback, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        with self._lock:
+            self._pending.append((func, args, kwargs))
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        try:
+            if registration_loop() is self.loop:
+                self.loop.call_soon(self._drain)
+            else:
+                self.loop.call_soon_threadsafe(self._drain)
+        except RuntimeError as error:
+            # Loop fechado: as entregas pendentes não têm mais destino
+            with self._lock:
+                dropped = len(self._pending)
+                self._pending.clear()
+                self._scheduled = False
+            print(f"[PubSub] Dropping {dropped} async deliveries: {error}")
+
+    def _drain(self):
+        with self._lock:
+            batch = [self._pending.popleft() for _ in range(min(LOOP_BATCH, len(self._pending)))]
+            if self._pending:
+                self.loop.call_soon(self._drain)
+            else:
+                self._scheduled = False
+
+        for func, args, kwargs in batch:
+            try:
+                task = self.loop.create_task(func(*args, **kwargs))
+            except Exception as error:
+                print(f"[PubSub] Error running {func}: {error}")
+                continue
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done(func))
+
+    def _task_done(self, func: Callback) -> Callable[["asyncio.Task[Any]"], None]:
+        def done(task: "asyncio.Task[Any]"):
+            self._tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                print(f"[PubSub] Error running {func}: {task.exception()}")
+        return done
+
+
+class AsyncDelivery:
+    """
+    Adaptador síncrono de um subscriber `async def`: chamado pelo publish,
+    agenda a corrotina no loop onde a inscrição foi feita (ou, sem ele, no
+    loop padrão configurado, ou no loop de quem publica).
+    """
+    __slots__ = ("func", "loop")
+
+    def __init__(self, func: Callback, loop: Optional[asyncio.AbstractEventLoop]):
+        self.func = func
+        self.loop = loop
+
+    def __call__(self, *args: Any, **kwargs: Any):
+        loop = self.loop or _default_loop or registration_loop()
+        if loop is None:
+            raise RuntimeError(
+                f"No event loop for async subscriber {self.func}: subscribe it from a running loop "
+                "or set one with PubSub().configure(event_loop=...)"
+            )
+        dispatcher_for(loop).submit(self.func, args, kwargs)
+
+    def __repr__(self) -> str:
+        return f"<AsyncDelivery {self.func!r}>"
@@ -0,0 +1,122 @@
+from collections import deque
+from enum import Enum
+from threading import Condition
+from typing import Any, Deque, Dict, Hashable, Optional
+
+from ...types import Args, Kwargs
+from .topic_trie import TopicPath
+
+
+class OverflowPolicy(str, Enum):
+    """O que `publish_async` faz quando a fila de despacho está cheia."""
+    BLOCK = "block"              # o publicador espera haver espaço
+    DROP_OLDEST = "drop_oldest"  # descarta a mensagem pendente mais antiga
+    COALESCE = "coalesce"        # substitui a pendente de mesma chave; sem par, espera
+
+
+class Envelope:
+    """
+    Mensagem aguardando despacho assíncrono.
+
+    `topic` é o caminho hierárquico do tópico (raiz -> folha); `key`
+    identifica mensagens coalescíveis (None = nunca coalesce); `lane` define
+    a ordem de entrega.
+    """
+    __slots__ = ("topic", "args", "kwargs", "key", "lane")
+
+    def __init__(self, topic: TopicPath, args: Args, kwargs: Kwargs, key: Optional[Hashable], lane: Hashable = None):
+        self.topic = topic
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.lane = lane if lane is not None else topic
+
+
+class DispatchQueue:
+    """
+    Fila FIFO limitada com política de overflow.
+
+    Itens descartados ou coalescidos nunca são entregues; itens coalescidos
+    mantêm a posição original na fila, preservando a ordem por tópico.
+    """
+
+    def __init__(self, maxsize: int = 10_000, policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+
+        self._items: Deque[Envelope] = deque()
+        self._by_key: Dict[Hashable, Envelope] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = Condition()
+
+    def put(self, envelope: Envelope, wait: bool = True):
+        """
+        Enfileira `envelope`. Com `wait=False`, uma fila cheia em que a
+        política mandaria esperar aceita o item acima do limite.
+        """
+        with self._cond:
+            while self.maxsize > 0 and self._size >= self.maxsize and not self._closed:
+                if self.policy is OverflowPolicy.DROP_OLDEST:
+                    self._drop_oldest()
+                    break
+
+                if self.policy is OverflowPolicy.COALESCE and envelope.key is not None:
+                    pending = self._by_key.get(envelope.key)
+                    if pending is not None:
+                        pending.args = envelope.args
+                        pending.kwargs = envelope.kwargs
+                        self.coalesced += 1
+                        return
+
+                if not wait:
+                    break
+                self._cond.wait()
+
+            if self._closed:
+                return
+
+            self._items.append(envelope)
+            if envelope.key is not None:
+                self._by_key[envelope.key] = envelope
+            self._size += 1
+            self._cond.notify_all()
+
+    def get(self) -> Optional[Envelope]:
+        """Bloqueia até haver um item; retorna None quando a fila é fechada."""
+        with self._cond:
+            while True:
+                if self._items:
+                    envelope = self._items.popleft()
+                    if envelope.key is not None and self._by_key.get(envelope.key) is envelope:
+                        del self._by_key[envelope.key]
+                    self._size -= 1
+                    self._cond.notify_all()
+                    return envelope
+
+                if self._closed:
+                    return None
+
+                self._cond.wait()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def qsize(self) -> int:
+        with self._cond:
+            return self._size
+
+    def _drop_oldest(self):
+        envelope = self._items.popleft()
+        if envelope.key is not None and self._by_key.get(envelope.key) is envelope:
+            del self._by_key[envelope.key]
+        self._size -= 1
+        self.dropped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"size": self._size, "maxsize": self.maxsize, "dropped": self.dropped, "coalesced": self.coalesced}
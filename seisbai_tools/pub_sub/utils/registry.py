@@ -0,0 +1,195 @@
+from inspect import ismethod
+from threading import RLock
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+from weakref import WeakMethod
+
+from ...types import Callback
+from .async_dispatch import AsyncDelivery, is_async_callback, registration_loop
+from .topic_trie import TopicPath, TopicTrie, is_pattern, split_pattern
+
+# Notificado após cada escrita com o tópico alterado e a nova contagem
+RegistryWatcher = Callable[[str, int], None]
+
+
+class Subscriber:
+    """
+    Entrada do registro. Métodos ligados são guardados como `WeakMethod`
+    para não manter a instância viva; quando ela é coletada, o finalizador
+    remove a entrada do registro.
+
+    Subscribers `async def` são entregues como tasks no event loop em
+    execução no momento da inscrição (ver `AsyncDelivery`).
+    """
+    __slots__ = ("topic", "key", "_callback", "_weak", "_async", "_loop", "_delivery")
+
+    def __init__(self, topic: str, callback: Callback, registry: "SubscriberRegistry"):
+        self.topic = topic
+
+        if ismethod(callback):
+            # Identifica o callback sem manter a instância viva
+            self.key: Hashable = (id(callback.__self__), callback.__func__)
+            self._callback: Optional[Callback] = None
+            self._weak: Optional[WeakMethod[Callback]] = WeakMethod(
+                callback, lambda _, entry=self: registry.prune(entry)
+            )
+        else:
+            self.key = callback
+            self._callback = callback
+            self._weak = None
+
+        self._async = is_async_callback(callback)
+        self._loop = registration_loop() if self._async else None
+        # Funções async têm o adaptador pronto; métodos o montam ao resolver
+        self._delivery: Optional[AsyncDelivery] = (
+            AsyncDelivery(callback, self._loop) if self._async and self._weak is None else None
+        )
+
+    def resolve(self) -> Optional[Callback]:
+        if self._delivery is not None:
+            return self._delivery
+
+        callback = self._weak() if self._weak is not None else self._callback
+        if self._async and callback is not None:
+            return AsyncDelivery(callback, self._loop)
+        return callback
+
+    def matches(self, callback: Callback) -> bool:
+        resolved = self._weak() if self._weak is not None else self._callback
+        return resolved is not None and (resolved is callback or resolved == callback)
+
+
+class SubscriberRegistry:
+    """
+    Registro de subscribers por tópico com cópia na escrita (copy-on-write).
+
+    Escritas (subscribe/unsubscribe/prune) montam um novo dicionário de tuplas
+    imutáveis sob lock e o publicam com uma única atribuição; leituras usam o
+    snapshot vigente sem lock algum.
+
+    Tópicos com curingas (`Event.*`, `*.ProgressUpdatedEvent`) ficam
+    em uma `TopicTrie` e só são considerados por `get_path`, que resolve um
+    caminho hierárquico inteiro de uma vez e guarda o resultado até a próxima
+    escrita.
+
+    Observadores registrados com `watch` recebem `(tópico, contagem)` após
+    cada escrita, fora do lock (ex.: bridges que repassam inscrições).
+    """
+
+    def __init__(self):
+        # Reentrante: o finalizador de um WeakMethod pode disparar (via GC)
+        # enquanto a própria thread já está dentro de uma escrita
+        self._lock = RLock()
+        self._topics: Dict[str, Tuple[Subscriber, ...]] = {}
+        self._patterns = TopicTrie()
+        self._pattern_counts: Dict[str, int] = {}
+        self._path_cache: Dict[TopicPath, Tuple[Subscriber, ...]] = {}
+        self._watchers: Tuple[RegistryWatcher, ...] = ()
+
+    def get(self, topic: str) -> Tuple[Subscriber, ...]:
+        return self._topics.get(topic, ())
+
+    def get_path(self, path: TopicPath) -> Tuple[Subscriber, ...]:
+        """
+        União, sem duplicatas, dos subscribers de todos os segmentos de `path`
+        (folha primeiro) e dos padrões que casam com ele.
+        """
+        cached = self._path_cache.get(path)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            # O dicionário capturado aqui é descartado na próxima escrita,
+            # então o resultado nunca sobrevive a uma mudança do registro
+            cache = self._path_cache
+            resolved = self._resolve_path(path)
+            cache[path] = resolved
+            return resolved
+
+    def count(self, topic: str) -> int:
+        if is_pattern(topic):
+            return self._pattern_counts.get(topic, 0)
+        return len(self._topics.get(topic, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """Contagem por tópico, incluindo padrões."""
+        counts = {topic: len(subscribers) for topic, subscribers in self._topics.items()}
+        counts.update(self._pattern_counts)
+        return counts
+
+    def watch(self, watcher: RegistryWatcher):
+        with self._lock:
+            self._watchers = self._watchers + (watcher,)
+
+    def unwatch(self, watcher: RegistryWatcher):
+        with self._lock:
+            self._watchers = tuple(w for w in self._watchers if w is not watcher)
+
+    def add(self, topic: str, callback: Callback) -> Subscriber:
+        subscriber = Subscriber(topic, callback, self)
+        with self._lock:
+            if is_pattern(topic):
+                self._patterns.add(split_pattern(topic), subscriber)
+                self._set_pattern_count(topic, 1)
+            else:
+                self._replace(topic, self._topics.get(topic, ()) + (subscriber,))
+        self._notify(topic)
+        return subscriber
+
+    def remove(self, topic: str, callback: Callback):
+        self._discard(topic, lambda s: s.matches(callback))
+
+    def prune(self, subscriber: Subscriber):
+        """Remove a entrada cujo callback foi coletado (chamado pelo finalizador)."""
+        self._discard(subscriber.topic, lambda s: s is subscriber)
+
+    def _discard(self, topic: str, predicate: Callable[[Subscriber], bool]):
+        with self._lock:
+            if is_pattern(topic):
+                removed = self._patterns.remove(split_pattern(topic), predicate)
+                if not removed:
+                    return
+                self._set_pattern_count(topic, -removed)
+            else:
+                current = self._topics.get(topic)
+                if not current:
+                    return
+                kept = tuple(s for s in current if not predicate(s))
+                if len(kept) == len(current):
+                    return
+                self._replace(topic, kept)
+        self._notify(topic)
+
+    def _notify(self, topic: str):
+        for watcher in self._watchers:
+            watcher(topic, self.count(topic))
+
+    def _set_pattern_count(self, topic: str, delta: int):
+        counts = dict(self._pattern_counts)
+        counts[topic] = counts.get(topic, 0) + delta
+        if counts[topic] <= 0:
+            del counts[topic]
+        self._pattern_counts = counts
+        self._path_cache = {}
+
+    def _replace(self, topic: str, subscribers: Tuple[Subscriber, ...]):
+        topics = dict(self._topics)
+        if subscribers:
+            topics[topic] = subscribers
+        else:
+            topics.pop(topic, None)
+        self._topics = topics
+        self._path_cache = {}
+
+    def _resolve_path(self, path: TopicPath) -> Tuple[Subscriber, ...]:
+        resolved: List[Subscriber] = []
+        seen: Set[Hashable] = set()
+
+        candidates = [s for segment in reversed(path) for s in self._topics.get(segment, ())]
+        candidates.extend(self._patterns.match(path))
+
+        for subscriber in candidates:
+            if subscriber.key not in seen:
+                seen.add(subscriber.key)
+                resolved.append(subscriber)
+
+        return tuple(resolved)
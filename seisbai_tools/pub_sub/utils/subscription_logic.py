@@ -1,5 +1,5 @@
 from functools import wraps
-from inspect import signature
+from inspect import iscoroutinefunction, signature
 from ..pub_sub import PubSub
 from ...types import Args, Callback, Kwargs
 
@@ -12,6 +12,15 @@ def apply_subscription_logic(topic: str, function: Callback):
         function._event_topic = topic
         
         return function
+    elif iscoroutinefunction(function):
+        # Continua `async def`: o PubSub entrega no event loop da inscrição
+        @wraps(function)
+        async def async_wrapper(*args: Args, **kwargs: Kwargs):
+            return await function(*args, **kwargs)
+
+        PubSub().subscribe(topic, async_wrapper)
+
+        return async_wrapper
     else:
         @wraps(function)
         
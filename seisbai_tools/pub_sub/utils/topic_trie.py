@@ -0,0 +1,118 @@
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Caminho hierárquico de um tópico, da raiz para a folha.
+# Ex.: ("Base", "Event", "ProgressUpdatedEvent", "DownloadProgressUpdatedEvent")
+TopicPath = Tuple[str, ...]
+
+SEPARATOR = "."
+_GLOB_CHARS = frozenset("*?[")
+
+
+def is_pattern(topic: str) -> bool:
+    """
+    Tópicos com curingas (`*`, `?`, `[`) são padrões; os demais, inclusive
+    nomes com `.` como `jobs.done`, são nomes exatos.
+    """
+    return not _GLOB_CHARS.isdisjoint(topic)
+
+
+def split_pattern(pattern: str) -> TopicPath:
+    """Segmentos de um padrão; um nome exato é um único segmento."""
+    if not is_pattern(pattern):
+        return (pattern,)
+    return tuple(pattern.split(SEPARATOR))
+
+
+class _Node:
+    __slots__ = ("literals", "globs", "values")
+
+    def __init__(self):
+        self.literals: Dict[str, "_Node"] = {}
+        self.globs: Dict[str, "_Node"] = {}
+        self.values: List = []
+
+
+class TopicTrie:
+    """
+    Trie de padrões de tópico, um segmento por nível.
+
+    Um padrão casa com qualquer trecho contíguo do caminho hierárquico, da
+    mesma forma que um nome exato casa com a classe e todas as subclasses:
+
+    - `Event.*` : filhos e demais descendentes de `Event`;
+    - `*.ProgressUpdatedEvent` : `ProgressUpdatedEvent` sob qualquer pai;
+    - `Download*` : qualquer segmento que comece com `Download`.
+
+    Dentro de um segmento valem os curingas do `fnmatch` (`*`, `?`, `[...]`).
+    Não é thread-safe; o `SubscriberRegistry` serializa o acesso.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: TopicPath, value: T):
+        node = self._root
+        for segment in pattern:
+            table = node.globs if not _GLOB_CHARS.isdisjoint(segment) else node.literals
+            node = table.setdefault(segment, _Node())
+        node.values.append(value)
+        self._size += 1
+
+    def remove(self, pattern: TopicPath, predicate: Callable[[T], bool]) -> int:
+        """
+        Remove os valores do padrão para os quais `predicate` é verdadeiro e
+        retorna quantos foram removidos.
+        """
+        trail: List[Tuple[_Node, Dict[str, _Node], str]] = []
+        node = self._root
+
+        for segment in pattern:
+            table = node.globs if not _GLOB_CHARS.isdisjoint(segment) else node.literals
+            child = table.get(segment)
+            if child is None:
+                return 0
+            trail.append((node, table, segment))
+            node = child
+
+        kept = [value for value in node.values if not predicate(value)]
+        removed = len(node.values) - len(kept)
+        self._size -= removed
+        node.values = kept
+
+        # Poda os nós que ficaram vazios, da folha para a raiz
+        for parent, table, segment in reversed(trail):
+            child = table[segment]
+            if child.values or child.literals or child.globs:
+                break
+            del table[segment]
+
+        return removed
+
+    def match(self, path: TopicPath) -> List[T]:
+        """Valores de todos os padrões que casam com algum trecho de `path`."""
+        found: List[T] = []
+        if not self._size:
+            return found
+
+        for start in range(len(path)):
+            self._walk(self._root, path, start, found)
+        return found
+
+    def _walk(self, node: _Node, path: TopicPath, index: int, found: List[T]):
+        if index == len(path):
+            return
+
+        segment = path[index]
+        children = [node.literals[segment]] if segment in node.literals else []
+        children.extend(child for glob, child in node.globs.items() if fnmatchcase(segment, glob))
+
+        for child in children:
+            found.extend(child.values)
+            self._walk(child, path, index + 1, found)
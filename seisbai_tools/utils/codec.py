@@ -0,0 +1,125 @@
+"""
+Codec binário (msgpack) para comandos, eventos e DTOs.
+
+Cada valor vai em um envelope `[caminho_do_tipo, payload]`; o payload é
+codificado e decodificado pelo msgspec em C, de forma tipada, com um
+`Decoder` pré-construído por tipo. Diferente de `utils.msgspec.serialize`,
+não há marcadores `__class_path__`/`__type__` nem recursão em Python.
+
+Valores que não são `msgspec.Struct` usam caminho vazio e são decodificados
+sem tipo (listas, dicts e primitivos do msgpack). Arrays numpy viajam como
+extensão msgpack e voltam como views sem cópia (ver `utils.ndarray`).
+"""
+
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+import msgspec
+from ulid import ULID, from_bytes
+
+from ..pub_sub import PubSub
+from .get_class_type import get_type
+from .import_path import get_import_path
+from .ndarray import array_to_ext, ext_hook, is_ndarray
+
+
+_UNTYPED = ""
+
+# Envelopes ainda não decodificados: o payload fica como msgpack cru
+_Envelope = Tuple[str, msgspec.Raw]
+
+
+def _enc_hook(obj: Any) -> Any:
+    if isinstance(obj, ULID):
+        return obj.bytes
+    if is_ndarray(obj):
+        return array_to_ext(obj)
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+
+def _dec_hook(cls: Type, obj: Any) -> Any:
+    if cls is ULID and isinstance(obj, (bytes, bytearray)):
+        return from_bytes(bytes(obj))
+    if is_ndarray(obj):
+        return obj
+    raise NotImplementedError(f"Objects of type {cls} are not supported")
+
+
+_encoder = msgspec.msgpack.Encoder(enc_hook=_enc_hook)
+_envelope_decoder = msgspec.msgpack.Decoder(_Envelope)
+_envelopes_decoder = msgspec.msgpack.Decoder(List[_Envelope])
+_untyped_decoder = msgspec.msgpack.Decoder(ext_hook=ext_hook)
+
+_decoders: Dict[str, msgspec.msgpack.Decoder] = {}
+_paths: Dict[type, str] = {}
+_lock = Lock()
+
+
+# --------------------------------------------------
+# REGISTRO DE TIPOS
+# --------------------------------------------------
+
+def register_type(cls: type) -> str:
+    """
+    Pré-constrói o `Decoder` de `cls` e retorna o caminho usado no envelope.
+    Tipos não registrados são registrados na primeira ocorrência.
+    """
+    path = get_import_path(cls)
+    with _lock:
+        if path not in _decoders:
+            _decoders[path] = msgspec.msgpack.Decoder(cls, dec_hook=_dec_hook, ext_hook=ext_hook)
+            _paths[cls] = path
+    return path
+
+
+def _path_of(obj: Any) -> str:
+    cls = type(obj)
+    path = _paths.get(cls)
+    if path is not None:
+        return path
+    if isinstance(obj, msgspec.Struct):
+        return register_type(cls)
+    return _UNTYPED
+
+
+def _decoder_for(path: str) -> msgspec.msgpack.Decoder:
+    decoder = _decoders.get(path)
+    if decoder is None:
+        register_type(get_type(path))
+        decoder = _decoders[path]
+    return decoder
+
+
+def _open(envelope: _Envelope) -> Any:
+    path, raw = envelope
+    if path == _UNTYPED:
+        return _untyped_decoder.decode(raw)
+    return _decoder_for(path).decode(raw)
+
+
+# --------------------------------------------------
+# API
+# --------------------------------------------------
+
+def encode(obj: Any) -> bytes:
+    return _encoder.encode((_path_of(obj), obj))
+
+
+def decode(data: bytes) -> Any:
+    """
+    Decodifica um valor produzido por `encode`. Comandos/eventos são
+    reconstruídos sem publicar nem registrar log.
+    """
+    envelope = _envelope_decoder.decode(data)
+    with PubSub().suppressed():
+        return _open(envelope)
+
+
+def encode_many(objs: Iterable[Any]) -> bytes:
+    return _encoder.encode([(_path_of(obj), obj) for obj in objs])
+
+
+def decode_many(data: bytes) -> List[Any]:
+    envelopes = _envelopes_decoder.decode(data)
+    with PubSub().suppressed():
+        return [_open(envelope) for envelope in envelopes]
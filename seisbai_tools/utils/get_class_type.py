@@ -1,10 +1,29 @@
 import importlib
+from functools import lru_cache
+from typing import Dict
+
+from .import_path import get_import_path
+
+# Tipos registrados explicitamente (ex.: subclasses de `Base`, ao serem definidas)
+_registry: Dict[str, type] = {}
+
+
+def register_class_path(cls: type) -> type:
+    """
+    Registra `cls` para que `get_type` o resolva sem passar pelo sistema de
+    importação. Pode ser usado como decorador.
+    """
+    _registry[get_import_path(cls)] = cls
+    return cls
 
 
 def get_type(path: str) -> type:
     """
     Importa dinamicamente um tipo a partir de seu caminho completo.
 
+    Tipos registrados com `register_class_path` são resolvidos por um dicionário;
+    os demais são importados uma vez e mantidos em um cache LRU.
+
     Parameters
     ----------
     path : str
@@ -28,6 +47,14 @@ def get_type(path: str) -> type:
     >>> from datetime import datetime
     >>> assert dt_type is datetime
     """
+    cls = _registry.get(path)
+    if cls is not None:
+        return cls
+    return _import_type(path)
+
+
+@lru_cache(maxsize=1024)
+def _import_type(path: str) -> type:
     module_name, class_name = path.rsplit(".", 1)
     module = importlib.import_module(module_name)
-    return getattr(module, class_name)
\ No newline at end of file
+    return getattr(module, class_name)
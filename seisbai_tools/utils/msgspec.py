@@ -2,9 +2,12 @@ from datetime import datetime
 from uuid import UUID
 from typing import Any
 import msgspec
-import importlib
 from ulid import ULID, from_str
 
+from ..pub_sub import PubSub
+from .get_class_type import get_type
+from .ndarray import array_from_json, array_to_json, is_ndarray
+
 def serialize(obj: Any) -> bytes:
     def convert(o):
         # Tipos especiais
@@ -15,13 +18,9 @@ def serialize(obj: Any) -> bytes:
         if isinstance(o, datetime):
             return {"__type__": "datetime", "value": o.isoformat()}
         
-        # numpy arrays - converter para lista
-        try:
-            import numpy as np
-            if isinstance(o, np.ndarray):
-                return {"__type__": "numpy.ndarray", "value": o.tolist(), "shape": list(o.shape), "dtype": str(o.dtype)}
-        except ImportError:
-            pass
+        # numpy arrays - bytes crus em base64, com dtype e shape
+        if is_ndarray(o):
+            return array_to_json(o)
 
         # msgspec.Struct
         if isinstance(o, msgspec.Struct):
@@ -45,6 +44,10 @@ def serialize(obj: Any) -> bytes:
 
 # --- Desserialização automática ---
 def deserialize(data: bytes) -> Any:
+    """
+    Reconstrói o objeto serializado. Comandos/eventos são recriados sem
+    publicar nem registrar log: a mensagem original já foi emitida.
+    """
     obj = msgspec.json.decode(data)
 
     def restore(o):
@@ -58,13 +61,13 @@ def deserialize(data: bytes) -> Any:
                     return UUID(o["value"])
                 if t == "datetime":
                     return datetime.fromisoformat(o["value"])
+                if t == "numpy.ndarray":
+                    return array_from_json(o)
 
             # Instância de msgspec.Struct
             cls_path = o.get("__class_path__")
             if cls_path:
-                module_name, class_name = cls_path.rsplit(".", 1)
-                module = importlib.import_module(module_name)
-                cls = getattr(module, class_name)
+                cls = get_type(cls_path)
                 data = {k: restore(v) for k, v in o.items() if k != "__class_path__"}
                 return cls(**data)
 
@@ -76,4 +79,5 @@ def deserialize(data: bytes) -> Any:
 
         return o
 
-    return restore(obj)
\ No newline at end of file
+    with PubSub().suppressed():
+        return restore(obj)
\ No newline at end of file
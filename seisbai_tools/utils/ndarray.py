@@ -0,0 +1,234 @@
+"""
+Transporte de `numpy.ndarray` sem conversão para listas.
+
+O array viaja como dtype + shape + bytes crus: no msgpack, como extensão
+(`ARRAY_EXT`); no JSON, como base64. A decodificação devolve uma view
+somente-leitura (`np.frombuffer`) sobre o próprio buffer recebido, sem cópia.
+
+Para processos no mesmo host, `share_arrays()` faz os arrays grandes irem por
+memória compartilhada (`SHARED_ARRAY_EXT`): a mensagem leva apenas o nome do
+segmento, e o receptor mapeia o mesmo buffer.
+
+Ciclo de vida dos segmentos:
+
+- O processo que publica é o dono: mantém os segmentos mais recentes até
+  `max_bytes` (ver `share_arrays`) e remove (unlink) os mais antigos além
+  disso, em `release_shared_arrays` ou no fim do processo. Um receptor que
+  decodifica a mensagem depois que o segmento saiu recebe `FileNotFoundError`.
+- O receptor nunca remove o segmento: apenas o mapeia e fecha o mapeamento
+  quando não restam arrays (ou views) apontando para ele. Mapeamentos já
+  abertos continuam válidos mesmo após o unlink do dono.
+
+O numpy é opcional: só é importado quando há arrays envolvidos.
+"""
+
+import atexit
+import base64
+import sys
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+import msgspec
+
+ARRAY_EXT = 1         # [dtype, shape] + bytes
+SHARED_ARRAY_EXT = 2  # [dtype, shape, nome do segmento]
+
+_header_encoder = msgspec.msgpack.Encoder()
+_header_decoder = msgspec.msgpack.Decoder(list)
+_HEADER_SIZE = 4
+
+# (tamanho mínimo em bytes, limite do pool do dono); (0, 0) = desligado
+_share_limits: ContextVar[Tuple[int, int]] = ContextVar("ndarray_share_limits", default=(0, 0))
+
+# Segmentos criados por este processo, do mais antigo ao mais novo, com o tamanho
+_owned_segments: Deque[Tuple[Any, int]] = deque()
+_owned_bytes = 0
+# Segmentos mapeados por este processo e referências fracas aos arrays sobre eles
+_attached_segments: Dict[str, Tuple[Any, List["weakref.ref[Any]"]]] = {}
+_segments_lock = Lock()
+
+
+def is_ndarray(obj: Any) -> bool:
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(obj, np.ndarray)
+
+
+# --------------------------------------------------
+# MSGPACK
+# --------------------------------------------------
+
+def array_to_ext(array: Any) -> msgspec.msgpack.Ext:
+    import numpy as np
+
+    array = np.ascontiguousarray(array)
+    if array.dtype.hasobject:
+        raise TypeError("Arrays of Python objects cannot be serialized")
+
+    threshold, max_bytes = _share_limits.get()
+    if threshold and array.nbytes >= threshold:
+        name = _to_shared_memory(array, max_bytes)
+        header = _header_encoder.encode([array.dtype.str, list(array.shape), name])
+        return msgspec.msgpack.Ext(SHARED_ARRAY_EXT, header)
+
+    header = _header_encoder.encode([array.dtype.str, list(array.shape)])
+    data = len(header).to_bytes(_HEADER_SIZE, "big") + header + memoryview(array).cast("B")
+    return msgspec.msgpack.Ext(ARRAY_EXT, data)
+
+
+def ext_hook(code: int, data: memoryview) -> Any:
+    """`ext_hook` para `msgspec.msgpack.Decoder`."""
+    import numpy as np
+
+    if code == ARRAY_EXT:
+        size = int.from_bytes(data[:_HEADER_SIZE], "big")
+        dtype, shape = _header_decoder.decode(data[_HEADER_SIZE:_HEADER_SIZE + size])
+        # View sobre o buffer da mensagem: sem cópia e somente-leitura
+        return np.frombuffer(data[_HEADER_SIZE + size:], dtype=np.dtype(dtype)).reshape(shape)
+
+    if code == SHARED_ARRAY_EXT:
+        dtype, shape, name = _header_decoder.decode(data)
+        return _attach_shared_memory(name, lambda buf: np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=buf))
+
+    raise NotImplementedError(f"Unknown msgpack extension type {code}")
+
+
+# --------------------------------------------------
+# JSON
+# --------------------------------------------------
+
+def array_to_json(array: Any) -> Dict[str, Any]:
+    import numpy as np
+
+    array = np.ascontiguousarray(array)
+    return {
+        "__type__": "numpy.ndarray",
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+        "data": base64.b64encode(memoryview(array).cast("B")).decode("ascii"),
+    }
+
+
+def array_from_json(value: Dict[str, Any]) -> Any:
+    """Restaura o formato atual (`data` em base64) e o legado (`value` em lista)."""
+    import numpy as np
+
+    dtype = np.dtype(value["dtype"])
+    shape = tuple(value["shape"])
+
+    if "data" in value:
+        return np.frombuffer(base64.b64decode(value["data"]), dtype=dtype).reshape(shape)
+    return np.asarray(value["value"], dtype=dtype).reshape(shape)
+
+
+# --------------------------------------------------
+# MEMÓRIA COMPARTILHADA
+# --------------------------------------------------
+
+@contextmanager
+def share_arrays(min_bytes: int = 1024 * 1024, max_bytes: int = 1024 ** 3) -> Iterator[None]:
+    """
+    Dentro do bloco, arrays com pelo menos `min_bytes` são codificados em
+    memória compartilhada. Só use quando todos os receptores estão no mesmo
+    host.
+
+    Este processo mantém os segmentos mais recentes até somar `max_bytes`;
+    ao passar disso, os mais antigos são removidos (o mais novo sempre fica).
+    Dimensione `max_bytes` para cobrir as mensagens ainda em trânsito:
+    receptores que já mapearam um segmento não são afetados pela remoção.
+    """
+    token = _share_limits.set((min_bytes, max_bytes))
+    try:
+        yield
+    finally:
+        _share_limits.reset(token)
+
+
+def release_shared_arrays():
+    """Remove (unlink) os segmentos criados por este processo."""
+    global _owned_bytes
+
+    with _segments_lock:
+        segments = [segment for segment, _ in _owned_segments]
+        _owned_segments.clear()
+        _owned_bytes = 0
+
+    for segment in segments:
+        _unlink_quietly(segment)
+
+
+def _to_shared_memory(array: Any, max_bytes: int) -> str:
+    import numpy as np
+    from multiprocessing import shared_memory
+
+    global _owned_bytes
+
+    size = max(array.nbytes, 1)
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+
+    expired = []
+    with _segments_lock:
+        _owned_segments.append((segment, size))
+        _owned_bytes += size
+        while _owned_bytes > max_bytes and len(_owned_segments) > 1:
+            old, old_size = _owned_segments.popleft()
+            _owned_bytes -= old_size
+            expired.append(old)
+
+    for old in expired:
+        _unlink_quietly(old)
+    return segment.name
+
+
+def _unlink_quietly(segment: Any):
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        segment.close()
+    except BufferError:
+        pass
+
+
+def _attach_shared_memory(name: str, make_array: Any) -> Any:
+    from multiprocessing import shared_memory
+
+    with _segments_lock:
+        _close_unused_segments()
+
+        entry = _attached_segments.get(name)
+        if entry is None:
+            try:
+                # Quem cria é dono do segmento; o receptor não deve removê-lo
+                segment = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                segment = shared_memory.SharedMemory(name=name)
+            entry = _attached_segments[name] = (segment, [])
+
+        segment, arrays = entry
+        array = make_array(segment.buf)
+        array.flags.writeable = False
+        # Views derivadas mantêm o array base vivo: basta acompanhar este
+        arrays.append(weakref.ref(array))
+        return array
+
+
+def _close_unused_segments():
+    """Fecha os mapeamentos sem arrays vivos (chamado com o lock adquirido)."""
+    for name, (segment, arrays) in list(_attached_segments.items()):
+        arrays[:] = [ref for ref in arrays if ref() is not None]
+        if arrays:
+            continue
+        try:
+            segment.close()
+        except BufferError:
+            continue  # ainda exportado (ex.: memoryview externa); tenta depois
+        del _attached_segments[name]
+
+
+atexit.register(release_shared_arrays)
@@ -1,51 +1,135 @@
-from queue import Empty, Queue
-from threading import Event, Thread, current_thread
-from typing import Any, Tuple, Dict
+import asyncio
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from threading import Thread, current_thread
+from typing import Any, Dict, Optional, Tuple
 
 from ..types import Callback
 
+# Chamada enfileirada: (função, args, kwargs, future ou None)
+_Call = Tuple[Callback, Tuple[Any, ...], Dict[str, Any], Optional[Future]]
+
+# Sentinela de parada: tudo o que foi enfileirado antes dela ainda é executado
+_STOP = object()
+
 
 class ThreadWithLoop(Thread):
-    """Thread que possui um loop interno e permite invocar funções dentro dela."""
+    """
+    Thread que possui um loop interno e permite invocar funções dentro dela.
+
+    O loop bloqueia na fila sem timeout (thread ociosa não acorda) e, a cada
+    despertar, executa em sequência até `max_batch` chamadas já enfileiradas.
+    `stop()` enfileira uma sentinela: as chamadas anteriores são executadas e
+    a thread termina logo em seguida; as posteriores são descartadas (e seus
+    futures, cancelados).
+    """
     _registry: Dict[int, "ThreadWithLoop"] = {}
 
-    def __init__(self, *args: Any, **kwargs: Any):
+    def __init__(self, *args: Any, max_batch: int = 64, **kwargs: Any):
         super().__init__(*args, **kwargs)
-        self._queue: Queue[Tuple[Callback, Any, Any]] = Queue()
-        self._event = Event()
-        self._event.set()
+        self.max_batch = max_batch
+        self._queue: "SimpleQueue[Any]" = SimpleQueue()
+        self._stopping = False
 
     def run(self):
         """Executa o loop interno da thread."""
         if self.ident:
             ThreadWithLoop._registry[self.ident] = self
-        
+
             try:
                 self.__loop()
             finally:
                 ThreadWithLoop._registry.pop(self.ident)
+                self.__cancel_pending()
 
     def __loop(self):
         """Loop principal da thread."""
-        while self._event.is_set():
+        queue = self._queue
+
+        while True:
+            item = queue.get()
+
+            # Drena o que já está na fila sem voltar a bloquear
+            for _ in range(self.max_batch):
+                if item is _STOP:
+                    return
+                self._execute(item)
+                try:
+                    item = queue.get_nowait()
+                except Empty:
+                    break
+            else:
+                # Lote cheio: o item já retirado volta a ser o próximo
+                if item is _STOP:
+                    return
+                self._execute(item)
+
+    @staticmethod
+    def _execute(call: _Call):
+        func, args, kwargs, future = call
+
+        if future is None:
             try:
-                func, args, kwargs = self._queue.get(timeout=0.5)
                 func(*args, **kwargs)
+            except Exception as error:
+                print(f"[ThreadWithLoop] Error running {func}: {error}")
+            return
+
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+
+    def __cancel_pending(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
             except Empty:
-                continue
+                return
+            if item is not _STOP and item[3] is not None:
+                item[3].cancel()
 
     def invoke(self, func: Callback, *args: Any, **kwargs: Any):
         """Executa `func` dentro da thread atual (de forma assíncrona)."""
-        self._queue.put((func, args, kwargs))
+        self._enqueue(func, args, kwargs, None)
+
+    def invoke_future(self, func: Callback, *args: Any, **kwargs: Any) -> "Future[Any]":
+        """
+        Executa `func` dentro da thread e retorna um `Future` com o resultado
+        (ou a exceção). Chamado de dentro da própria thread, executa na hora:
+        esperar o resultado na fila travaria o loop.
+        """
+        future: "Future[Any]" = Future()
+
+        if current_thread() is self:
+            self._execute((func, args, kwargs, future))
+        else:
+            self._enqueue(func, args, kwargs, future)
+
+        return future
+
+    def invoke_async(self, func: Callback, *args: Any, **kwargs: Any) -> "asyncio.Future[Any]":
+        """Como `invoke_future`, mas aguardável no event loop corrente."""
+        return asyncio.wrap_future(self.invoke_future(func, *args, **kwargs))
+
+    def _enqueue(self, func: Callback, args: Tuple[Any, ...], kwargs: Dict[str, Any], future: Optional[Future]):
+        if self._stopping and future is not None:
+            future.cancel()
+        else:
+            self._queue.put((func, args, kwargs, future))
 
     def stop(self):
-        """Para o loop e encerra a thread."""
-        self._event.clear()
+        """Para o loop e encerra a thread (após as chamadas já enfileiradas)."""
+        if not self._stopping:
+            self._stopping = True
+            self._queue.put(_STOP)
 
     @classmethod
     def get_current(cls) -> "ThreadWithLoop | None":
         """Retorna a instância registrada da thread atual, se houver."""
         thread_id = current_thread().ident
-        
+
         if thread_id:
-            return cls._registry.get(thread_id)
\ No newline at end of file
+            return cls._registry.get(thread_id)
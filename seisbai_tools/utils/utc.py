@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Normaliza `value` para UTC. Valores sem fuso (naive) são tratados como
+    UTC, a mesma convenção dos carimbos de tempo de comandos e eventos.
+
+    Parameters
+    ----------
+    value : datetime
+        Data/hora com ou sem fuso.
+
+    Returns
+    -------
+    datetime
+        Data/hora com `tzinfo=timezone.utc`.
+
+    Examples
+    --------
+    >>> as_utc(datetime(2024, 1, 1, 12, 0))
+    datetime.datetime(2024, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)